@@ -7,20 +7,31 @@
 
 from collections.abc import (Iterable, MutableMapping, MutableSequence,
                              MutableSet)
+from copy import copy as shallowcopy
 from copy import deepcopy
+from itertools import islice
 
-from .utils import EPSILON, PathLimit, are_different, dot_lookup
+from .utils import (EPSILON, LazyCopy, ListKey, NodePath, PathCache, PathLimit,
+                    PathMatcher, _multiset_difference, _myers_opcodes,
+                    add_items, are_different, copy_container, different_items,
+                    dot_lookup, item_key, remove_items, run_steps,
+                    same_subtree, split_node)
 from .version import __version__
 
 (ADD, REMOVE, CHANGE) = (
     'add', 'remove', 'change')
 
-__all__ = ('diff', 'patch', 'swap', 'revert', 'dot_lookup', '__version__')
+__all__ = ('diff', 'are_equal', 'patch', 'swap', 'revert', 'dot_lookup',
+           '__version__')
 
 DICT_TYPES = (MutableMapping, )
 LIST_TYPES = (MutableSequence, )
 SET_TYPES = (MutableSet, )
 
+_UNORDERED = object()
+# Marker yielded by ``_diff(..., tick=N)`` after every N steps of work.
+_TICK = ('tick',)
+
 try:
     import numpy
     HAS_NUMPY = True
@@ -30,12 +41,15 @@ except ImportError:  # pragma: no cover
 
 
 def diff(first, second, node=None, ignore=None, path_limit=None, expand=False,
-         tolerance=EPSILON, absolute_tolerance=None, dot_notation=True):
+         tolerance=EPSILON, absolute_tolerance=None, dot_notation=True,
+         prune=False, copy='deep', list_algorithm='index', list_keys=None,
+         unordered=None, vectorize_arrays=False, max_diffs=None,
+         list_max_cost=1024):
     """Compare two dictionary/list/set objects, and returns a diff result.
 
     Return an iterator with differences between two objects. The diff items
-    represent addition/deletion/change and the item value is a *deep copy*
-    from the corresponding source or destination objects.
+    represent addition/deletion/change and the item value is by default a
+    *deep copy* from the corresponding source or destination objects.
 
     >>> from dictdiffer import diff
     >>> result = diff({'a': 'b'}, {'a': 'c'})
@@ -47,6 +61,17 @@ def diff(first, second, node=None, ignore=None, path_limit=None, expand=False,
 
     >>> list(diff({'a': 1, 'b': 2}, {'a': 3, 'b': 4}, ignore=set(['a'])))
     [('change', 'b', (2, 4))]
+
+    A ``*`` key in the ignored paths matches any key on its level:
+
+    >>> list(diff({'items': [{'id': 1, 'checksum': 'a'}]},
+    ...           {'items': [{'id': 2, 'checksum': 'b'}]},
+    ...           ignore=['items.*.checksum']))
+    [('change', ['items', 0, 'id'], (1, 2))]
+
+    Other containers than builtin sets, lists and tuples are queried for
+    every compared key:
+
     >>> class IgnoreCase(set):
     ...     def __contains__(self, key):
     ...         return set.__contains__(self, str(key).lower())
@@ -90,6 +115,47 @@ def diff(first, second, node=None, ignore=None, path_limit=None, expand=False,
     ... dot_notation=False))
     [('change', ['a', 'x'], (1, 2))]
 
+    The values in the diff items can be copied differently or not at all:
+
+    >>> value = {'b': 'c'}
+    >>> (_, _, [(_, added)]), = diff({}, {'a': value}, copy='none')
+    >>> added is value
+    True
+    >>> (_, _, [(_, added)]), = diff({}, {'a': value}, copy='lazy')
+    >>> added
+    LazyCopy({'b': 'c'})
+    >>> added.value is value
+    False
+
+    Lists are compared index by index unless they are aligned by the
+    minimal number of insertions and removals:
+
+    >>> list(diff([1, 2, 3], [0, 1, 2, 3]))
+    [('change', [0], (1, 0)), ('change', [1], (2, 1)), \
+('change', [2], (3, 2)), ('add', '', [(3, 3)])]
+    >>> list(diff([1, 2, 3], [0, 1, 2, 3], list_algorithm='myers'))
+    [('add', '', [(0, 0)])]
+
+    Lists of records can be matched by a key field instead of the index:
+
+    >>> list(diff({'users': [{'id': 1, 'name': 'a'}, {'id': 2}]},
+    ...           {'users': [{'id': 2}, {'id': 1, 'name': 'b'}]},
+    ...           list_keys={'users': 'id'}))
+    [('change', ['users', ListKey('id', 1), 'name'], ('a', 'b'))]
+
+    Lists of unhashable items can be compared regardless of the order:
+
+    >>> list(diff({'tags': [{'a': 1}, {'b': 2}]},
+    ...           {'tags': [{'b': 2}, {'a': 1}, {'c': 3}]},
+    ...           unordered=['tags']))
+    [('add', 'tags', [(2, {'c': 3})])]
+
+    Identical subtrees can be skipped without visiting their children:
+
+    >>> shared = {'x': list(range(1000))}
+    >>> list(diff({'a': shared, 'b': 1}, {'a': shared, 'b': 2}, prune=True))
+    [('change', 'b', (1, 2))]
+
     :param first: The original dictionary, ``list`` or ``set``.
     :param second: New dictionary, ``list`` or ``set``.
     :param node: Key for comparison that can be used in :func:`dot_lookup`.
@@ -103,6 +169,62 @@ def diff(first, second, node=None, ignore=None, path_limit=None, expand=False,
     :param absolute_tolerance: Absolute threshold to consider when comparing
                                two float numbers.
     :param dot_notation: Boolean to toggle dot notation on and off.
+    :param prune: Skip subtrees that are the same object or compare equal
+                  before recursing into them.  The children of a node are
+                  compared all at once, so e.g. only the changed rows of
+                  a long list of records are visited.  This is also the
+                  fastest way to diff many documents against one baseline.
+    :param copy: How the values in the diff items are copied from the
+                 original objects: ``'deep'`` (default) deep copies them
+                 sharing one memo for the whole diff, ``'shallow'`` copies
+                 only the top-level container, ``'none'`` returns references
+                 to the original values and ``'lazy'`` wraps them in
+                 :class:`dictdiffer.utils.LazyCopy` proxies which deep copy
+                 the value on first access.
+    :param list_algorithm: ``'index'`` (default) compares lists item by
+                           item at the same index.  ``'myers'`` aligns them
+                           with the Myers algorithm: changed items keep
+                           their index in *first*, removals follow and then
+                           insertions with their index in *second*.
+    :param list_keys: Dictionary mapping list paths to the key field of
+                      their records.  The records of these lists are matched
+                      by the key value and addressed in the diff items with
+                      :class:`dictdiffer.utils.ListKey` path items.  Added
+                      records are appended to the list by :func:`patch`.
+                      Lists whose records are not dictionaries with unique
+                      key values are compared as usual.
+    :param unordered: Paths of lists compared as multisets.  Only the items
+                      without an equal item in the other list are reported:
+                      removals with their index in *first* followed by
+                      insertions with their index in *second*.  Patching
+                      these lists keeps the order of the remaining items.
+    :param vectorize_arrays: Compare NumPy arrays of the same shape all at
+                             once instead of item by item.  A single
+                             `change` item is reported for each array, its
+                             last path item is the tuple of the index arrays
+                             of the different items (as returned by
+                             :func:`numpy.nonzero`) and its values are the
+                             arrays of their old and new values.  Arrays
+                             with different shapes are changed as a whole.
+                             Arrays of Python objects and arrays with
+                             ignored or *list_keys* paths below them are
+                             still compared item by item.  The same items
+                             are found either way: as for the items
+                             compared one by one, the tolerances only
+                             apply to ``float64`` items, whose NumPy type
+                             is a subclass of :class:`float`.
+    :param max_diffs: Stop after this number of diff items, without
+                      visiting the rest of the objects.
+    :param list_max_cost: Maximum number of insertions and removals searched
+                          by the ``'myers'`` alignment at once, ``None`` for
+                          no limit.  Lists needing more edits are split on
+                          the items occurring once in both of them and the
+                          parts are aligned separately, see
+                          :func:`dictdiffer.utils.myers_opcodes`.  A part
+                          which still needs more edits is compared index
+                          by index, so the alignment is not always the
+                          shortest one.  The time and memory needed grow
+                          with the square of this value.
 
     .. versionchanged:: 0.3
        Added *ignore* parameter.
@@ -121,6 +243,37 @@ def diff(first, second, node=None, ignore=None, path_limit=None, expand=False,
 
     .. versionchanged:: 0.8
         Added *dot_notation* parameter.
+
+    .. versionchanged:: 0.10
+        Added *prune* parameter.
+        Key ``*`` in *ignore* paths matches any key.
+        Added *copy* parameter.
+        Added *list_algorithm* parameter.
+        Added *list_keys* parameter.
+        Added *unordered* parameter.
+        Added *vectorize_arrays* parameter.
+        Added *max_diffs* parameter.
+        Added *list_max_cost* parameter.
+    """
+    return _diff(first, second, node=node, ignore=ignore,
+                 path_limit=path_limit, expand=expand, tolerance=tolerance,
+                 absolute_tolerance=absolute_tolerance,
+                 dot_notation=dot_notation, prune=prune, copy=copy,
+                 list_algorithm=list_algorithm, list_keys=list_keys,
+                 unordered=unordered, vectorize_arrays=vectorize_arrays,
+                 max_diffs=max_diffs, list_max_cost=list_max_cost)
+
+
+def _diff(first, second, node=None, ignore=None, path_limit=None,
+          expand=False, tolerance=EPSILON, absolute_tolerance=None,
+          dot_notation=True, prune=False, copy='deep', list_algorithm='index',
+          list_keys=None, unordered=None, vectorize_arrays=False,
+          max_diffs=None, list_max_cost=1024, tick=None):
+    """Compare two objects as :func:`diff` does.
+
+    With a *tick* number, the ``_TICK`` marker is also yielded after every
+    *tick* steps of work: compared children, copied values and compared
+    items of the list alignments.
     """
     if path_limit is not None and not isinstance(path_limit, PathLimit):
         path_limit = PathLimit(path_limit)
@@ -137,151 +290,527 @@ def diff(first, second, node=None, ignore=None, path_limit=None, expand=False,
 
         ignore = type(ignore)(_process_ignore_value(value) for value in ignore)
 
+    ignore_matcher = None
+    if type(ignore) in (set, frozenset, list, tuple):
+        # Compile plain containers into a trie walked along with the nodes.
+        ignore_matcher = PathMatcher(
+            (value.split('.') if isinstance(value, str) else value, True)
+            for value in ignore if isinstance(value, (str, tuple))
+        )
+
+    if copy == 'deep':
+        memo = {}
+
+        def copy_value(value):
+            return deepcopy(value, memo)
+    elif copy == 'shallow':
+        copy_value = shallowcopy
+    elif copy == 'none':
+        def copy_value(value):
+            return value
+    elif copy == 'lazy':
+        memo = {}
+
+        def copy_value(value):
+            return LazyCopy(value, memo)
+    else:
+        raise ValueError(
+            "copy must be one of 'deep', 'shallow', 'none' or 'lazy'")
+
+    if list_algorithm not in ('index', 'myers'):
+        raise ValueError("list_algorithm must be 'index' or 'myers'")
+
+    list_rules = None
+    if list_keys or unordered:
+        def _rule_path(path):
+            if isinstance(path, str):
+                return path.split('.') if path else ()
+            return path
+
+        list_rules = PathMatcher(
+            [(_rule_path(path), _UNORDERED) for path in unordered or ()] +
+            [(_rule_path(path), field)
+             for path, field in (list_keys or {}).items()]
+        )
+
+    kinds = {}
+    ticks = 0
+
+    def kind_of(value):
+        """Return the container types matching the value class or ``None``.
+
+        The ABC checks are done once per class and diff call.
+        """
+        cls = value.__class__
+        try:
+            return kinds[cls]
+        except KeyError:
+            for types in (DICT_TYPES, LIST_TYPES, SET_TYPES):
+                if isinstance(value, types):
+                    break
+            else:
+                types = None
+            kinds[cls] = types
+            return types
+
+    def _index_records(records, field):
+        """Return record keys in order and records indexed by the key.
+
+        ``None`` is returned unless all records are dictionaries with a
+        unique hashable value of the key field.
+        """
+        keys = []
+        index = {}
+        for record in records:
+            if kind_of(record) is not DICT_TYPES or field not in record:
+                return None
+            key = record[field]
+            try:
+                if key in index:
+                    return None
+            except TypeError:
+                return None
+            keys.append(key)
+            index[key] = record
+        return keys, index
+
+    def _count():
+        """Count a step of work and yield ``_TICK`` on every tick."""
+        nonlocal ticks
+        ticks += 1
+        if ticks >= tick:
+            ticks = 0
+            yield _TICK
+
+    def _run(steps):
+        """Run the steps of a computation and return its result.
+
+        ``_TICK`` is yielded on every tick.
+        """
+        if not tick:
+            return run_steps(steps)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+            yield from _count()
+
+    def _unequal(intersection):
+        """Drop the pairs of values which are the same subtree."""
+        if not tick:
+            return [item for item in intersection
+                    if not same_subtree(item[1], item[2])]
+        unequal = []
+        for item in intersection:
+            if not same_subtree(item[1], item[2]):
+                unequal.append(item)
+            yield from _count()
+        return unequal
+
+    def _copied(items):
+        """Return the pairs of keys and copied values.
+
+        ``_TICK`` is yielded on every tick.
+        """
+        if not tick:
+            return [(key, copy_value(value)) for key, value in items]
+        copied = []
+        for key, value in items:
+            copied.append((key, copy_value(value)))
+            yield from _count()
+        return copied
+
     def dotted(node, default_type=list):
         """Return dotted notation."""
-        if dot_notation and \
-            all(map(lambda x: isinstance(x, str) and '.' not in x,
-                node)):
-            return '.'.join(node)
-        else:
-            return default_type(node)
-
-    def _diff_recursive(_first, _second, _node=None):
-        _node = _node or []
-
-        dotted_node = dotted(_node)
-
-        differ = False
-
-        if isinstance(_first, DICT_TYPES) and isinstance(_second, DICT_TYPES):
+        if dot_notation:
+            dotted_node = node.dotted()
+            if dotted_node is not None:
+                return dotted_node
+        return default_type(node.keys())
+
+    def _diff_node(_first, _second, _node, _ignored, _listed):
+        """Yield differences of a container node and frames of its children.
+
+        Child containers are not iterated here.  Their generators are
+        yielded instead and ``_diff_iterative`` runs them on its explicit
+        stack.  *_ignored* and *_listed* hold the states of the ignore and
+        list rule matchers reached by the node path.
+        """
+        ignored = {}
+        kind = kind_of(_first)
+        removals_first = False
+
+        if kind is DICT_TYPES:
             # dictionaries are not hashable, we can't use sets
-            def check(key):
-                """Test if key in current node should be ignored."""
-                return ignore is None or (
-                    dotted(_node + [key], default_type=tuple) not in ignore and
-                    tuple(_node + [key]) not in ignore
-                )
-
-            intersection = [k for k in _first if k in _second and check(k)]
-            addition = [k for k in _second if k not in _first and check(k)]
-            deletion = [k for k in _first if k not in _second and check(k)]
-
-            differ = True
-
-        elif isinstance(_first, LIST_TYPES) and isinstance(_second,
-                                                           LIST_TYPES):
-            len_first = len(_first)
-            len_second = len(_second)
-
-            intersection = list(range(0, min(len_first, len_second)))
-            addition = list(range(min(len_first, len_second), len_second))
-            deletion = list(
-                reversed(range(min(len_first, len_second), len_first)))
-
-            differ = True
+            if _ignored:
+                def check(key):
+                    """Test if key in current node should be ignored."""
+                    ignored[key] = states = ignore_matcher.step(_ignored, key)
+                    return ignore_matcher.match(states) is None
+            elif ignore is not None and ignore_matcher is None:
+                def check(key):
+                    """Test if key in current node should be ignored."""
+                    return (
+                        dotted(_node.child(key), default_type=tuple)
+                        not in ignore and
+                        tuple(_node.child(key).keys()) not in ignore
+                    )
+            else:
+                check = None
+
+            if check is None:
+                intersection = [(k, _first[k], _second[k])
+                                for k in _first if k in _second]
+                addition = [(k, _second[k])
+                            for k in _second if k not in _first]
+                deletion = [(k, _first[k])
+                            for k in _first if k not in _second]
+            else:
+                intersection = [(k, _first[k], _second[k]) for k in _first
+                                if k in _second and check(k)]
+                addition = [(k, _second[k]) for k in _second
+                            if k not in _first and check(k)]
+                deletion = [(k, _first[k]) for k in _first
+                            if k not in _second and check(k)]
+
+            if prune:
+                intersection = yield from _unequal(intersection)
+
+        elif kind is LIST_TYPES:
+            rule = list_rules.match(_listed) if _listed else None
+            records = None
+            if rule is not None and rule is not _UNORDERED:
+                records = (_index_records(_first, rule),
+                           _index_records(_second, rule))
+                if None in records:
+                    records = None
+
+            if records is not None:
+                # Records are matched by their key field instead of their
+                # position and addressed with ``ListKey`` path items.
+                (first_keys, first_index), (second_keys, second_index) = \
+                    records
+                intersection = [
+                    (ListKey(rule, k), first_index[k], second_index[k])
+                    for k in first_keys if k in second_index]
+                addition = [(ListKey(rule, k), second_index[k])
+                            for k in second_keys if k not in first_index]
+                deletion = [(ListKey(rule, k), first_index[k])
+                            for k in first_keys if k not in second_index]
+                if prune:
+                    intersection = yield from _unequal(intersection)
+            elif rule is _UNORDERED:
+                # Only the multiplicity differences of the items are
+                # reported, removals first as for the Myers alignment.
+                removed, added = yield from _run(
+                    _multiset_difference(_first, _second, same_subtree))
+                intersection = []
+                addition = [(j, _second[j]) for j in added]
+                deletion = [(i, _first[i]) for i in reversed(removed)]
+                removals_first = True
+            elif list_algorithm == 'myers':
+                # Changed items keep the index of the first list, removals
+                # are applied next and then insertions with the indexes of
+                # the second list.
+                intersection = []
+                addition = []
+                deletion = []
+                opcodes = yield from _run(_myers_opcodes(
+                    _first, _second, same_subtree, list_max_cost))
+                for tag, i1, i2, j1, j2 in opcodes:
+                    if tag == 'equal':
+                        continue
+                    paired = min(i2 - i1, j2 - j1)
+                    intersection.extend(
+                        (i1 + k, _first[i1 + k], _second[j1 + k])
+                        for k in range(paired))
+                    deletion.extend(
+                        (i, _first[i]) for i in range(i1 + paired, i2))
+                    addition.extend(
+                        (j, _second[j]) for j in range(j1 + paired, j2))
+                deletion.reverse()
+                removals_first = True
+                if prune:
+                    intersection = yield from _unequal(intersection)
+            else:
+                len_first = len(_first)
+                len_second = len(_second)
+                common = min(len_first, len_second)
+
+                if prune and not tick:
+                    # Equal items, e.g. the unchanged records of a large
+                    # table, are skipped in bulk without building frames.
+                    intersection = [
+                        (i, first_value, second_value)
+                        for i, (first_value, second_value)
+                        in enumerate(zip(_first, _second))
+                        if not same_subtree(first_value, second_value)]
+                elif prune:
+                    intersection = yield from _unequal(
+                        (i, first_value, second_value)
+                        for i, (first_value, second_value)
+                        in enumerate(zip(_first, _second)))
+                else:
+                    intersection = [(i, _first[i], _second[i])
+                                    for i in range(common)]
+                addition = [(i, _second[i])
+                            for i in range(common, len_second)]
+                deletion = [(i, _first[i])
+                            for i in reversed(range(common, len_first))]
+
+            if _ignored:
+                for key, _, _ in intersection:
+                    ignored[key] = ignore_matcher.step(_ignored, key)
+                for key, _ in addition:
+                    ignored[key] = ignore_matcher.step(_ignored, key)
 
-        elif isinstance(_first, SET_TYPES) and isinstance(_second, SET_TYPES):
+        else:
             # Deep copy is not necessary for hashable items.
             addition = _second - _first
             if len(addition):
-                yield ADD, dotted_node, [(0, addition)]
+                yield ADD, dotted(_node), [(0, addition)]
             deletion = _first - _second
             if len(deletion):
-                yield REMOVE, dotted_node, [(0, deletion)]
+                yield REMOVE, dotted(_node), [(0, deletion)]
 
             return  # stop here for sets
 
-        if differ:
-            # Compare if object is a dictionary or list.
-            #
-            # NOTE variables: intersection, addition, deletion contain only
-            # hashable types, hence they do not need to be deepcopied.
-            #
-            # Call again the parent function as recursive if dictionary have
-            # child objects.  Yields `add` and `remove` flags.
-            for key in intersection:
-                # if type is not changed,
-                # callees again diff function to compare.
-                # otherwise, the change will be handled as `change` flag.
-                if path_limit and path_limit.path_is_limit(_node + [key]):
-                    if _first[key] == _second[key]:
-                        return
-
-                    yield CHANGE, _node + [key], (
-                        deepcopy(_first[key]), deepcopy(_second[key])
-                    )
-                else:
-                    recurred = _diff_recursive(
-                        _first[key], _second[key],
-                        _node=_node + [key],
-                    )
+        # Compare if object is a dictionary or list.
+        #
+        # NOTE variables: intersection, addition, deletion contain keys
+        # with references to the original values, which are copied only
+        # when they are emitted.
+        #
+        # Yield frames for child objects and `add` and `remove` flags.
+        for key, first_value, second_value in intersection:
+            if tick:
+                yield from _count()
+
+            # if type is not changed,
+            # the child frame compares the values.
+            # otherwise, the change will be handled as `change` flag.
+            child_node = _node.child(key)
+            if path_limit and path_limit.path_is_limit(child_node.keys()):
+                if same_subtree(first_value, second_value):
+                    continue
+
+                yield CHANGE, child_node.keys(), (
+                    copy_value(first_value), copy_value(second_value)
+                )
+            else:
+                child = _diff_child(
+                    first_value, second_value, child_node,
+                    ignored.get(key, ()),
+                    list_rules.step(_listed, key) if _listed else (),
+                )
+                if child is not None:
+                    yield child
 
-                    for diffed in recurred:
-                        yield diffed
-
-            if addition:
-                if path_limit:
-                    collect = []
-                    collect_recurred = []
-                    for key in addition:
-                        if not isinstance(_second[key],
-                                          SET_TYPES + LIST_TYPES + DICT_TYPES):
-                            collect.append((key, deepcopy(_second[key])))
-                        elif path_limit.path_is_limit(_node + [key]):
-                            collect.append((key, deepcopy(_second[key])))
-                        else:
-                            collect.append((key, _second[key].__class__()))
-                            recurred = _diff_recursive(
-                                _second[key].__class__(),
-                                _second[key],
-                                _node=_node + [key],
-                            )
-
-                            collect_recurred.append(recurred)
-
-                    if expand:
-                        for key, val in collect:
-                            yield ADD, dotted_node, [(key, val)]
-                    else:
-                        yield ADD, dotted_node, collect
-
-                    for recurred in collect_recurred:
-                        for diffed in recurred:
-                            yield diffed
-                else:
-                    if expand:
-                        for key in addition:
-                            yield ADD, dotted_node, [
-                                (key, deepcopy(_second[key]))]
-                    else:
-                        yield ADD, dotted_node, [
-                            # for additions, return a list that consist with
-                            # two-pair tuples.
-                            (key, deepcopy(_second[key])) for key in addition]
-
-            if deletion:
-                if expand:
-                    for key in deletion:
-                        yield REMOVE, dotted_node, [
-                            (key, deepcopy(_first[key]))]
+        if removals_first:
+            yield from _removed(_node, deletion)
+            yield from _added(_node, addition, ignored, _listed)
+        else:
+            yield from _added(_node, addition, ignored, _listed)
+            yield from _removed(_node, deletion)
+
+    def _added(_node, addition, ignored, _listed):
+        """Yield `add` flags and with a path limit frames of added values."""
+        if not addition:
+            return
+
+        if path_limit:
+            collect = []
+            collect_recurred = []
+            for key, value in addition:
+                if kind_of(value) is None:
+                    collect.append((key, copy_value(value)))
+                elif path_limit.path_is_limit(_node.child(key).keys()):
+                    collect.append((key, copy_value(value)))
+                    if tick:
+                        yield from _count()
                 else:
-                    yield REMOVE, dotted_node, [
-                        # for deletions, return the list of removed keys
-                        # and values.
-                        (key, deepcopy(_first[key])) for key in deletion]
+                    collect.append((key, value.__class__()))
+                    collect_recurred.append(_diff_child(
+                        value.__class__(),
+                        value,
+                        _node.child(key),
+                        ignored.get(key, ()),
+                        list_rules.step(_listed, key) if _listed else (),
+                    ))
+
+            if expand:
+                for key, val in collect:
+                    yield ADD, dotted(_node), [(key, val)]
+            else:
+                yield ADD, dotted(_node), collect
 
+            for recurred in collect_recurred:
+                if recurred is not None:
+                    yield recurred
+        else:
+            if expand:
+                for key, value in addition:
+                    yield ADD, dotted(_node), [(key, copy_value(value))]
+                    if tick:
+                        yield from _count()
+            else:
+                # for additions, return a list that consist with
+                # two-pair tuples.
+                collect = yield from _copied(addition)
+                yield ADD, dotted(_node), collect
+
+    def _removed(_node, deletion):
+        """Yield `remove` flags."""
+        if not deletion:
+            return
+
+        if expand:
+            for key, value in deletion:
+                yield REMOVE, dotted(_node), [(key, copy_value(value))]
+                if tick:
+                    yield from _count()
         else:
-            # Compare string and numerical types and yield `change` flag.
-            if are_different(_first, _second, tolerance, absolute_tolerance):
-                yield CHANGE, dotted_node, (deepcopy(_first),
-                                            deepcopy(_second))
+            # for deletions, return the list of removed keys
+            # and values.
+            collect = yield from _copied(deletion)
+            yield REMOVE, dotted(_node), collect
+
+    def _diff_child(_first, _second, _node, _ignored, _listed):
+        """Compare two values of the same node.
+
+        Return a generator for containers of the same kind, the `change`
+        item for other values that differ and ``None`` otherwise.
+        """
+        if (vectorize_arrays and HAS_NUMPY and
+                isinstance(_first, numpy.ndarray) and
+                isinstance(_second, numpy.ndarray) and not _ignored and
+                not (_listed and list_rules.match(_listed) is not None)):
+            return _diff_arrays(_first, _second, _node)
+
+        kind = kind_of(_first)
+        if kind is not None and kind is kind_of(_second):
+            return _diff_node(_first, _second, _node, _ignored, _listed)
+
+        # Compare string and numerical types and return `change` flag.
+        if are_different(_first, _second, tolerance, absolute_tolerance):
+            return CHANGE, dotted(_node), (copy_value(_first),
+                                           copy_value(_second))
+
+    def _diff_arrays(_first, _second, _node):
+        """Return the `change` item of two NumPy arrays or ``None``.
+
+        A generator comparing the items one by one is returned for arrays
+        of Python objects.
+        """
+        if _first.shape == _second.shape:
+            index = different_items(_first, _second, tolerance,
+                                    absolute_tolerance)
+            if index is None and _first.ndim:
+                return _diff_node(_first, _second, _node, (), ())
+            elif index is None:
+                if not are_different(_first[()], _second[()], tolerance,
+                                     absolute_tolerance):
+                    return None
+                index = ()
+        else:
+            index = ()
+
+        if not index:
+            return CHANGE, dotted(_node), (copy_value(_first),
+                                           copy_value(_second))
+        elif not len(index[0]):
+            return None
+        # Fancy indexing returns new arrays, no need to copy them.
+        return CHANGE, _node.keys() + [index], (_first[index], _second[index])
+
+    def _diff_iterative(_first, _second, _node=None):
+        """Walk both objects using an explicit stack of node generators.
+
+        Every diff item is passed straight to the caller, whatever the depth
+        of the node it belongs to, and deep structures do not hit the
+        recursion limit.
+        """
+        if max_diffs is not None and max_diffs <= 0:
+            return
+
+        _node = NodePath.from_keys(_node or [])
+        _ignored = () if ignore_matcher is None else \
+            ignore_matcher.walk(ignore_matcher.start, _node.keys())
+        _listed = () if list_rules is None else \
+            list_rules.walk(list_rules.start, _node.keys())
+        if prune and same_subtree(_first, _second):
+            return
+        root = _diff_child(_first, _second, _node, _ignored, _listed)
+        if root is None:
+            return
+        elif root.__class__ is tuple:
+            yield root
+            return
+
+        emitted = 0
+        stack = [root]
+        while stack:
+            for item in stack[-1]:
+                if item.__class__ is tuple:
+                    yield item
+                    if max_diffs is not None and item is not _TICK:
+                        emitted += 1
+                        if emitted >= max_diffs:
+                            return
+                else:
+                    stack.append(item)
+                    break
+            else:
+                stack.pop()
 
-    return _diff_recursive(first, second, node)
+    return _diff_iterative(first, second, node)
 
 
-def patch(diff_result, destination, in_place=False):
+def _limit(items, max_diffs):
+    """Return an iterator over the first *max_diffs* items, or all of them."""
+    if max_diffs is None:
+        return items
+    return islice(items, max(max_diffs, 0))
+
+
+def are_equal(first, second, **kwargs):
+    """Check if two objects have no differences.
+
+    The objects are compared as by :func:`diff` with the same arguments,
+    but the comparison stops at the first difference, equal subtrees are
+    skipped and no value is copied.
+
+        >>> are_equal({'a': [1, 2]}, {'a': [1, 2]})
+        True
+        >>> are_equal({'a': 1.0, 'b': 2}, {'a': 1.1, 'b': 3}, tolerance=0.2)
+        False
+        >>> are_equal({'a': 1.0, 'b': 2}, {'a': 1.1, 'b': 3}, tolerance=0.2,
+        ...           ignore=['b'])
+        True
+
+    :param first: The original dictionary, ``list`` or ``set``.
+    :param second: New dictionary, ``list`` or ``set``.
+    :param kwargs: Other arguments of :func:`diff`.
+
+    .. versionadded:: 0.10
+    """
+    kwargs.setdefault('prune', True)
+    kwargs['copy'] = 'none'
+    kwargs['max_diffs'] = 1
+    for _ in diff(first, second, **kwargs):
+        return False
+    return True
+
+
+def patch(diff_result, destination, in_place=False, copy='deep'):
     """Patch the diff result to the destination dictionary.
 
+    The containers modified by the diff items are looked up through a
+    :class:`dictdiffer.utils.PathCache`, so consecutive items sharing a
+    node do not walk the destination from its root again, and consecutive
+    additions or removals of the same node are applied together.
+
     :param diff_result: Changes returned by ``diff``.
     :param destination: Structure to apply the changes to.
     :param in_place: By default, destination dictionary is deep copied
@@ -289,52 +818,90 @@ def patch(diff_result, destination, in_place=False):
                      Setting ``in_place=True`` means that patch will apply
                      the changes directly to and return the destination
                      structure.
+    :param copy: How the destination is copied when *in_place* is false.
+                 ``'deep'`` (default) deep copies it.  ``'shared'`` only
+                 copies the containers along the paths of the diff items,
+                 and the returned structure shares all the other subtrees
+                 with the destination.  The containers have to support
+                 :func:`copy.copy`.
+
+    .. versionchanged:: 0.10
+       Added *copy* parameter.
     """
-    if not in_place:
-        destination = deepcopy(destination)
+    if copy not in ('deep', 'shared'):
+        raise ValueError("copy must be one of 'deep' or 'shared'")
 
-    def add(node, changes):
-        for key, value in changes:
-            dest = dot_lookup(destination, node)
-            if isinstance(dest, LIST_TYPES):
-                dest.insert(key, value)
-            elif isinstance(dest, SET_TYPES):
-                dest |= value
-            else:
-                dest[key] = value
-
-    def change(node, changes):
-        dest = dot_lookup(destination, node, parent=True)
-        if isinstance(node, str):
-            last_node = node.split('.')[-1]
-        else:
-            last_node = node[-1]
-        if isinstance(dest, LIST_TYPES):
-            last_node = int(last_node)
+    if in_place:
+        cache = PathCache(destination)
+    elif copy == 'deep':
+        destination = deepcopy(destination)
+        cache = PathCache(destination)
+    else:
+        cache = PathCache(destination, copy=copy_container)
+        destination = cache.source
+
+    lookup = cache.lookup
+    index = cache.index
+    # additions or removals waiting for the following items of their node
+    pending = None
+    merged = False
+    for action, node, changes in diff_result:
+        if pending is not None:
+            if action == pending[0] and node == pending[1]:
+                if not merged:
+                    pending = pending[0], pending[1], list(pending[2])
+                    merged = True
+                pending[2].extend(changes)
+                continue
+            _patch_items(lookup, index, *pending)
+            pending = None
+
+        if action != CHANGE:
+            pending = action, node, changes
+            merged = False
+            continue
+
+        # an empty dotted node is the '' key of the destination
+        keys = node.split('.') if isinstance(node, str) else list(node)
+        dest = lookup(keys[:-1])
         _, value = changes
-        dest[last_node] = value
-
-    def remove(node, changes):
-        for key, value in changes:
-            dest = dot_lookup(destination, node)
-            if isinstance(dest, SET_TYPES):
-                dest -= value
-            else:
-                del dest[key]
-
-    patchers = {
-        REMOVE: remove,
-        ADD: add,
-        CHANGE: change
-    }
+        if isinstance(value, LazyCopy):
+            value = value.value
+        key = keys[-1]
+        kind = type(dest)
+        if kind is dict or (kind is list and type(key) is int):
+            dest[key] = value
+        else:
+            dest[item_key(dest, key, index)] = value
+            if isinstance(key, ListKey):
+                index.forget(dest)
+        if len(keys) > 1 and type(keys[-2]) is ListKey and \
+                key == keys[-2].field:
+            # the key field of a record changes
+            index.forget(lookup(keys[:-2]))
+
+    if pending is not None:
+        _patch_items(lookup, index, *pending)
+    return destination
 
-    for action, node, changes in diff_result:
-        patchers[action](node, changes)
 
-    return destination
+def _patch_items(lookup, index, action, node, changes):
+    """Apply an addition or a removal of items."""
+    if isinstance(node, str):
+        keys = node.split('.') if node else []
+    else:
+        keys = list(split_node(node))
+    if action == ADD:
+        add_items(lookup(keys), changes, index)
+    else:
+        remove_items(lookup(keys), changes, index)
+    if keys and type(keys[-1]) is ListKey and \
+            any(key == keys[-1].field for key, _ in changes):
+        # the key field of a record is added or removed
+        index.forget(lookup(keys[:-1]))
 
 
-def swap(diff_result):
+def swap(diff_result, reverse=False):
     """Swap the diff result.
 
     It uses following mapping:
@@ -353,11 +920,28 @@ def swap(diff_result):
         >>> next(swapped)
         ('change', 'a.b.c', ('b', 'a'))
 
+    With ``reverse=True`` the diff items and the items of `remove` entries
+    come in reverse order too, so that the result undoes any diff when
+    patched:
+
+        >>> swapped = swap([('remove', 'a', [(2, 'c'), (1, 'b')])],
+        ...                reverse=True)
+        >>> next(swapped)
+        ('add', 'a', [(1, 'b'), (2, 'c')])
+
+    :param diff_result: Changes returned by ``diff``.
+    :param reverse: Reverse the order of the diff items and of the removed
+                    items.
+
+    .. versionchanged:: 0.10
+       Added *reverse* parameter.
     """
     def add(node, changes):
         return REMOVE, node, list(reversed(changes))
 
     def remove(node, changes):
+        if reverse:
+            return ADD, node, list(reversed(changes))
         return ADD, node, changes
 
     def change(node, changes):
@@ -370,13 +954,17 @@ def swap(diff_result):
         CHANGE: change
     }
 
+    if reverse:
+        diff_result = reversed(list(diff_result))
     for action, node, change in diff_result:
         yield swappers[action](node, change)
 
 
-def revert(diff_result, destination, in_place=False):
+def revert(diff_result, destination, in_place=False, copy='deep'):
     """Call swap function to revert patched dictionary object.
 
+    The swapped diff items are applied in reverse order.
+
     Usage example:
 
         >>> from dictdiffer import diff, revert
@@ -392,5 +980,10 @@ def revert(diff_result, destination, in_place=False):
                      is returned. Setting ``in_place=True`` means
                      that revert will apply the changes directly to
                      and return the destination structure.
+    :param copy: How the destination is copied, see :func:`patch`.
+
+    .. versionchanged:: 0.10
+       The diff items are reverted in reverse order.
+       Added *copy* parameter.
     """
-    return patch(swap(diff_result), destination, in_place)
+    return patch(swap(diff_result, reverse=True), destination, in_place, copy)
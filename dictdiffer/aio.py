@@ -0,0 +1,153 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Sub module to diff and patch without blocking an asyncio event loop."""
+
+import asyncio
+from copy import deepcopy
+from itertools import islice
+
+from . import _TICK, DICT_TYPES, _diff, patch
+from .parallel import _diff_chunk, _estimate_size
+
+
+async def adiff(first, second, batch_size=1000, executor=None,
+                offload_size=10000, **kwargs):
+    """Compare two objects and give control back to the event loop.
+
+    The objects are compared as by :func:`dictdiffer.diff` and the event
+    loop runs other tasks after every *batch_size* steps of work: compared
+    children, copied values and items compared to align lists.  The diff
+    items are returned as a list.
+
+        >>> import asyncio
+        >>> from dictdiffer.aio import adiff
+        >>> loop = asyncio.new_event_loop()
+        >>> loop.run_until_complete(adiff({'a': 1}, {'a': 2}))
+        [('change', 'a', (1, 2))]
+        >>> loop.close()
+
+    :param first: The original dictionary, ``list`` or ``set``.
+    :param second: New dictionary, ``list`` or ``set``.
+    :param batch_size: Number of steps of work between two switches to the
+                       event loop.
+    :param executor: Executor of :meth:`asyncio.loop.run_in_executor` used
+                     to compare the values of top-level keys of
+                     dictionaries estimated to have at least *offload_size*
+                     nodes.  All values are compared in the event loop by
+                     default.  The values and arguments must be picklable
+                     for a process pool.
+    :param offload_size: Estimated number of nodes of the values of a
+                         top-level key compared by the *executor*.
+    :param kwargs: Other arguments of :func:`dictdiffer.diff`.  The values
+                   not compared yet by the *executor* are cancelled once
+                   *max_diffs* items are found.
+    """
+    if executor is None or not isinstance(first, DICT_TYPES) or \
+            not isinstance(second, DICT_TYPES):
+        return await _diff_cooperative(first, second, batch_size, kwargs)
+
+    # Runs of consecutive common keys compared in the event loop, or a
+    # single key compared in the executor.
+    runs = []
+    for key in first:
+        if key not in second:
+            continue
+        offload = (_estimate_size(first[key]) +
+                   _estimate_size(second[key]) >= offload_size)
+        if offload or not runs or runs[-1][0]:
+            runs.append((offload, [key]))
+        else:
+            runs[-1][1].append(key)
+
+    loop = asyncio.get_event_loop()
+    futures = [
+        loop.run_in_executor(executor, _diff_chunk, (
+            {key: first[key] for key in keys},
+            {key: second[key] for key in keys},
+            kwargs)) if offload else None
+        for offload, keys in runs
+    ]
+
+    max_diffs = kwargs.get('max_diffs')
+    result = []
+    try:
+        for (offload, keys), future in zip(runs, futures):
+            if offload:
+                result.extend(await future)
+            else:
+                result.extend(await _diff_cooperative(
+                    {key: first[key] for key in keys},
+                    {key: second[key] for key in keys},
+                    batch_size, _remaining(kwargs, result)))
+            if max_diffs is not None and len(result) >= max_diffs:
+                return result[:max(max_diffs, 0)]
+    finally:
+        for future in futures:
+            if future is not None:
+                future.cancel()
+
+    result.extend(await _diff_cooperative(
+        {key: value for key, value in first.items() if key not in second},
+        {key: value for key, value in second.items() if key not in first},
+        batch_size, _remaining(kwargs, result)))
+    return result
+
+
+def _remaining(kwargs, result):
+    """Return the arguments of diff limited to the diff items left."""
+    if kwargs.get('max_diffs') is None:
+        return kwargs
+    return dict(kwargs, max_diffs=kwargs['max_diffs'] - len(result))
+
+
+async def _diff_cooperative(first, second, batch_size, kwargs):
+    """Return the diff items switching to the event loop on every tick."""
+    result = []
+    for item in _diff(first, second, tick=batch_size, **kwargs):
+        if item is _TICK:
+            await asyncio.sleep(0)
+        else:
+            result.append(item)
+    return result
+
+
+async def apatch(diff_result, destination, in_place=False, batch_size=100,
+                 executor=None):
+    """Patch the diff result to the destination and give control back.
+
+    The diff items are applied as by :func:`dictdiffer.patch` and the
+    event loop runs other tasks after every *batch_size* items.
+
+        >>> import asyncio
+        >>> from dictdiffer.aio import apatch
+        >>> loop = asyncio.new_event_loop()
+        >>> loop.run_until_complete(apatch([('change', 'a', (1, 2))],
+        ...                                {'a': 1}))
+        {'a': 2}
+        >>> loop.close()
+
+    :param diff_result: Changes returned by ``diff`` or ``adiff``.
+    :param destination: Structure to apply the changes to.
+    :param in_place: Apply the changes directly to the destination instead
+                     of a deep copy of it.
+    :param batch_size: Number of diff items applied between two switches to
+                       the event loop.
+    :param executor: Executor of :meth:`asyncio.loop.run_in_executor` used
+                     to deep copy the destination.
+    """
+    if not in_place:
+        if executor is None:
+            destination = deepcopy(destination)
+        else:
+            loop = asyncio.get_event_loop()
+            destination = await loop.run_in_executor(
+                executor, deepcopy, destination)
+
+    diff_result = iter(diff_result)
+    while True:
+        batch = list(islice(diff_result, batch_size))
+        if not batch:
+            return destination
+        patch(batch, destination, in_place=True)
+        await asyncio.sleep(0)
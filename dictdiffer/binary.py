@@ -0,0 +1,200 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Sub module to store diff results in a compact binary format.
+
+A file starts with the ``MAGIC`` bytes and contains a sequence of records,
+each made of an opcode byte followed by its fields.  Integers are stored as
+unsigned LEB128 varints and values are pickled with a varint length prefix.
+
+* ``PATH`` defines the next path id (counting from zero) with the pickled
+  node, so every node is stored once.
+* ``ADD``, ``REMOVE`` and ``CHANGE`` store a diff item as the id of its node
+  followed by its pickled changes.
+"""
+
+import mmap
+import pickle
+
+from . import ADD, CHANGE, REMOVE
+from .utils import unwrap
+
+MAGIC = b'DDIF\x01'
+
+PATH = 0x01
+OPCODES = {ADD: 0x10, REMOVE: 0x11, CHANGE: 0x12}
+ACTIONS = {opcode: action for action, opcode in OPCODES.items()}
+
+# Protocol 4 frames every pickle, which costs more than it saves for the
+# small values of most diff items.
+PROTOCOL = 3
+
+
+class DiffWriter(object):
+    """Write diff items to a binary file as they are produced.
+
+        >>> import io
+        >>> from dictdiffer import diff
+        >>> from dictdiffer.binary import DiffWriter, loads
+        >>> stream = io.BytesIO()
+        >>> writer = DiffWriter(stream)
+        >>> writer.write_all(diff({'a': {'b': 1}}, {'a': {'b': 2}}))
+        1
+        >>> list(loads(stream.getvalue()))
+        [('change', 'a.b', (1, 2))]
+
+    :param stream: Binary file object open for writing.
+    """
+
+    def __init__(self, stream):
+        """Write the header to the stream."""
+        self.stream = stream
+        self._paths = {}
+        self._path_count = 0
+        self.stream.write(MAGIC)
+
+    def write(self, item):
+        """Write a diff item."""
+        action, node, changes = item
+        path_id = self._path_id(node)
+        if action == CHANGE:
+            changes = tuple(unwrap(value) for value in changes)
+        else:
+            changes = [(key, unwrap(value)) for key, value in changes]
+        self.stream.write(bytes((OPCODES[action], )) + _varint(path_id) +
+                          _value(changes))
+
+    def write_all(self, diff_result):
+        """Write all the diff items and return their number."""
+        count = 0
+        for item in diff_result:
+            self.write(item)
+            count += 1
+        return count
+
+    def _path_id(self, node):
+        """Return the id of a node, defining it first if needed."""
+        # The dotted node 'a.b' and the list node ['a.b'] are different
+        # paths, and so are keys which are equal but of other types.
+        if isinstance(node, str):
+            key = ('s', node)
+        else:
+            key = ('l', ) + tuple((type(part), part) for part in node)
+        try:
+            return self._paths[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Nodes with unhashable keys are defined for every item.
+            key = None
+
+        path_id = self._path_count
+        self._path_count += 1
+        if key is not None:
+            self._paths[key] = path_id
+        self.stream.write(bytes((PATH, )) + _value(node))
+        return path_id
+
+
+def dump(diff_result, stream):
+    """Write diff items to a binary file object and return their number."""
+    return DiffWriter(stream).write_all(diff_result)
+
+
+def load(filename):
+    """Iterate over the diff items of a binary file.
+
+    The file is memory mapped and the items are decoded as they are
+    consumed, so they can be passed to :func:`dictdiffer.patch` without
+    holding all of them in memory.
+
+    The nodes and the values are unpickled, so files from untrusted sources
+    must not be loaded.
+
+    :param filename: Path of the file.
+    """
+    with open(filename, 'rb') as stream:
+        mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield from _items(memoryview(mapped))
+    finally:
+        mapped.close()
+
+
+def loads(data):
+    """Iterate over the diff items of a binary bytes-like object.
+
+    The nodes and the values are unpickled, so data from untrusted sources
+    must not be loaded.
+    """
+    return _items(memoryview(data))
+
+
+def _items(view):
+    """Decode the records of a memory view."""
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError('not a dictdiffer binary diff')
+
+    paths = []
+    position = len(MAGIC)
+    end = len(view)
+    try:
+        while position < end:
+            opcode = view[position]
+            position += 1
+            if opcode == PATH:
+                node, position = _read_value(view, position)
+                paths.append(node)
+                continue
+            try:
+                action = ACTIONS[opcode]
+            except KeyError:
+                raise ValueError('unknown opcode {0:#x} at offset {1}'.format(
+                    opcode, position - 1))
+            path_id, position = _read_varint(view, position)
+            changes, position = _read_value(view, position)
+            node = paths[path_id]
+            if isinstance(node, list):
+                node = list(node)
+            yield action, node, changes
+    except IndexError:
+        raise ValueError('truncated dictdiffer binary diff')
+    finally:
+        view.release()
+
+
+def _varint(number):
+    """Encode an unsigned integer."""
+    data = bytearray()
+    while number > 0x7f:
+        data.append(number & 0x7f | 0x80)
+        number >>= 7
+    data.append(number)
+    return bytes(data)
+
+
+def _value(value):
+    """Encode a value with its length."""
+    data = pickle.dumps(value, PROTOCOL)
+    return _varint(len(data)) + data
+
+
+def _read_varint(view, position):
+    """Decode an unsigned integer and return it with the next position."""
+    number = 0
+    shift = 0
+    while True:
+        byte = view[position]
+        position += 1
+        number |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return number, position
+        shift += 7
+
+
+def _read_value(view, position):
+    """Decode a value and return it with the next position."""
+    length, position = _read_varint(view, position)
+    if position + length > len(view):
+        raise IndexError(position)
+    return pickle.loads(view[position:position + length]), position + length
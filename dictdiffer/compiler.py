@@ -0,0 +1,284 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Sub module to compile diff results into Python patch functions."""
+
+import math
+from copy import deepcopy
+from functools import lru_cache
+
+from . import ADD, CHANGE
+from .utils import (ListKey, ListKeyIndex, add_items, copy_container, is_name,
+                    item_key, key_index, lookup_key, merge_items, remove_items,
+                    split_node, unwrap)
+
+#: Maximum number of containers held in local variables.
+MAX_LOCALS = 256
+
+_LITERAL_TYPES = (str, int, bool, type(None))
+_IMMUTABLE_TYPES = _LITERAL_TYPES + (float, complex, bytes)
+
+
+class CompiledPatch(object):
+    """Patch function generated for a diff result.
+
+    The diff items are translated once into the source of a Python function
+    in which the paths are already split, the containers shared by several
+    items are kept in local variables and only the keys which may index a
+    list are resolved when the function runs.  The code is compiled when
+    the patch is first applied, and the code of diff results with the same
+    items but other values is reused.
+
+        >>> from dictdiffer import diff
+        >>> from dictdiffer.compiler import compile_patch
+        >>> compiled = compile_patch(diff({'a': {'b': 1}}, {'a': {'b': 2}}))
+        >>> compiled({'a': {'b': 1}})
+        {'a': {'b': 2}}
+        >>> print(compiled.source())
+        def _patch(d, o, i):
+            v1 = d['a']
+            v1['b'] = _c0
+
+    Unlike :func:`dictdiffer.patch`, the mutable values of the diff items
+    are deep copied every time the patch is applied, so patched structures
+    do not share them.
+
+    :param diff_result: Changes returned by ``diff``.
+    """
+
+    def __init__(self, diff_result):
+        """Translate the diff items."""
+        self._items = list(merge_items(diff_result))
+        self._functions = {}
+
+    def __call__(self, destination, in_place=False, copy='deep'):
+        """Apply the patch to a destination.
+
+        :param destination: Structure to apply the changes to.
+        :param in_place: Apply the changes directly to the destination.
+        :param copy: How the destination is copied, see
+                     :func:`dictdiffer.patch`.
+        """
+        if copy not in ('deep', 'shared'):
+            raise ValueError("copy must be one of 'deep' or 'shared'")
+
+        shared = copy == 'shared' and not in_place
+        if shared:
+            destination = copy_container(None, destination)
+        elif not in_place:
+            destination = deepcopy(destination)
+
+        try:
+            function = self._functions[shared]
+        except KeyError:
+            function = self._functions[shared] = self._compile(shared)
+        function(destination, {id(destination): destination},
+                 ListKeyIndex())
+        return destination
+
+    def source(self, shared=False):
+        """Return the source of the patch function.
+
+        :param shared: Generate the function copying the containers along
+                       the paths, for ``copy='shared'``.
+        """
+        return _Generator(shared).generate(self._items)[0]
+
+    def _compile(self, shared):
+        """Return the patch function."""
+        source, constants = _Generator(shared).generate(self._items)
+        namespace = {
+            '_deepcopy': deepcopy,
+            '_add_items': add_items,
+            '_remove_items': remove_items,
+            '_item_key': item_key,
+            '_lookup_key': lookup_key,
+            '_own': _own,
+        }
+        for index, value in enumerate(constants):
+            namespace['_c{0}'.format(index)] = value
+        exec(_code(source), namespace)
+        return namespace['_patch']
+
+
+def compile_patch(diff_result):
+    """Return a :class:`CompiledPatch` applying the diff result.
+
+    :param diff_result: Changes returned by ``diff``.
+    """
+    return CompiledPatch(diff_result)
+
+
+@lru_cache(maxsize=64)
+def _code(source):
+    """Compile the source of a patch function."""
+    return compile(source, '<dictdiffer.compiler>', 'exec')
+
+
+def _own(owned, index, parent, key):
+    """Return the copy of a container item to modify."""
+    key, value = lookup_key(parent, key, index)
+    if id(value) not in owned:
+        copied = copy_container(parent, value)
+        if copied is not value:
+            parent[key] = value = copied
+        owned[id(value)] = value
+    return value
+
+
+class _Generator(object):
+    """Generate the source of a patch function."""
+
+    def __init__(self, shared):
+        """Prepare an empty function."""
+        self.shared = shared
+        self.lines = ['def _patch(d, o, i):']
+        self.constants = []
+        self.variables = {(): 'd'}
+        self.count = 0
+
+    def generate(self, items):
+        """Return the source and the constants of the function."""
+        for action, node, changes in items:
+            if action == CHANGE:
+                keys = split_node(node) if node != '' else ('', )
+                self.change(keys, changes)
+            elif action == ADD:
+                self.add(split_node(node), changes)
+            else:
+                self.remove(split_node(node), changes)
+        if len(self.lines) == 1:
+            self.emit('pass')
+        return '\n'.join(self.lines), self.constants
+
+    def emit(self, line):
+        """Append a line to the function body."""
+        self.lines.append('    ' + line)
+
+    def constant(self, value):
+        """Return the name of a constant."""
+        self.constants.append(value)
+        return '_c{0}'.format(len(self.constants) - 1)
+
+    def key(self, key):
+        """Return the expression of a key."""
+        if isinstance(key, _LITERAL_TYPES) or isinstance(key, float) and \
+                math.isfinite(key):
+            return repr(key)
+        return self.constant(key)
+
+    def value(self, value):
+        """Return the expression of a value copied when it is mutable."""
+        value = unwrap(value)
+        name = self.constant(value)
+        return name if _is_immutable(value) else '_deepcopy({0})'.format(
+            name)
+
+    def lookup(self, keys):
+        """Return the variable holding the container of a path."""
+        try:
+            return self.variables[keys]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable keys are looked up without a variable.
+            self.emit('t = d')
+            for key in keys:
+                self.emit('t = {0}'.format(self.item('t', key)))
+            return 't'
+
+        end = len(keys) - 1
+        while keys[:end] not in self.variables:
+            end -= 1
+        if self.count + len(keys) - end > MAX_LOCALS:
+            self.variables = {(): 'd'}
+            self.count = 0
+            end = 0
+        name = self.variables[keys[:end]]
+        for end in range(end, len(keys)):
+            self.count += 1
+            child = 'v{0}'.format(self.count)
+            self.emit('{0} = {1}'.format(child, self.item(name, keys[end])))
+            name = self.variables[keys[:end + 1]] = child
+        return name
+
+    def item(self, name, key):
+        """Return the expression of a container item."""
+        if self.shared:
+            return '_own(o, i, {0}, {1})'.format(name, self.key(key))
+        elif isinstance(key, ListKey):
+            return '{0}[i.find({0}, {1})]'.format(name, self.key(key))
+        elif key_index(key) is not None:
+            return '_lookup_key({0}, {1})[1]'.format(name, self.key(key))
+        return '{0}[{1}]'.format(name, self.key(key))
+
+    def forget(self, keys, inclusive=False):
+        """Forget the variables of the paths below the given path."""
+        size = len(keys)
+        for path in list(self.variables):
+            if len(path) > size - inclusive and path[:size] == keys:
+                del self.variables[path]
+
+    def change(self, keys, changes):
+        """Generate the replacement of a value."""
+        name = self.lookup(keys[:-1])
+        key = keys[-1]
+        value = self.value(changes[1])
+        if isinstance(key, ListKey) or key_index(key) is not None or \
+                isinstance(key, tuple):
+            self.emit('{0}[_item_key({0}, {1}, i)] = {2}'.format(
+                name, self.key(key), value))
+            if isinstance(key, ListKey):
+                self.emit('i.forget({0})'.format(name))
+            self.forget(keys[:-1])
+        else:
+            self.emit('{0}[{1}] = {2}'.format(name, self.key(key), value))
+            self.forget(keys, inclusive=True)
+        if len(keys) > 1 and isinstance(keys[-2], ListKey) and \
+                key == keys[-2].field:
+            # the key field of a record changes
+            self.emit('i.forget({0})'.format(self.lookup(keys[:-2])))
+
+    def add(self, keys, changes):
+        """Generate the addition of items."""
+        name = self.lookup(keys)
+        if all(is_name(key) for key, _ in changes):
+            for key, value in changes:
+                self.emit('{0}[{1}] = {2}'.format(
+                    name, self.key(key), self.value(value)))
+        elif all(isinstance(key, ListKey) for key, _ in changes):
+            for _, value in changes:
+                self.emit('{0}.append({1})'.format(name, self.value(value)))
+            self.emit('i.forget({0})'.format(name))
+        else:
+            self.emit('_add_items({0}, [{1}], i)'.format(name, ', '.join(
+                '({0}, {1})'.format(self.key(key), self.value(value))
+                for key, value in changes)))
+        self.forget_records(keys, changes)
+        self.forget(keys)
+
+    def remove(self, keys, changes):
+        """Generate the removal of items."""
+        name = self.lookup(keys)
+        if all(is_name(key) for key, _ in changes):
+            for key, _ in changes:
+                self.emit('del {0}[{1}]'.format(name, self.key(key)))
+        else:
+            self.emit('_remove_items({0}, [{1}], i)'.format(name, ', '.join(
+                '({0}, {1})'.format(self.key(key), self.constant(value))
+                for key, value in changes)))
+        self.forget_records(keys, changes)
+        self.forget(keys)
+
+    def forget_records(self, keys, changes):
+        """Generate forgetting a list whose record key fields change."""
+        if keys and isinstance(keys[-1], ListKey) and \
+                any(key == keys[-1].field for key, _ in changes):
+            self.emit('i.forget({0})'.format(self.lookup(keys[:-1])))
+
+
+def _is_immutable(value):
+    """Check if a value can be shared by the patched structures."""
+    if isinstance(value, (tuple, frozenset)):
+        return all(_is_immutable(item) for item in value)
+    return isinstance(value, _IMMUTABLE_TYPES)
@@ -0,0 +1,223 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Sub module to compose consecutive diff results into one."""
+
+from collections import OrderedDict
+
+from . import ADD, CHANGE, REMOVE, patch, revert
+from .utils import (ListKey, NodePath, is_name, key_index, merge_items,
+                    same_subtree, split_node, unwrap)
+
+_MISSING = object()
+
+
+def compose(*diffs):
+    """Fold consecutive diff results into a single equivalent diff result.
+
+    Each diff result must apply to the structure produced by the previous
+    ones.  The items are folded by path without the structures themselves:
+    an added value which is removed later cancels out, consecutive changes
+    of a value are collapsed into one change from the first old value to
+    the last new value and the changes of the children of a value which is
+    replaced later are folded into its old value.
+
+        >>> from dictdiffer.compose import compose
+        >>> compose([('change', 'a.b', (1, 2)), ('add', '', [('c', 1)])],
+        ...         [('change', 'a.b', (2, 3)), ('remove', '', [('c', 1)])])
+        [('change', 'a.b', (1, 3))]
+        >>> compose([('change', 'a.b', (1, 2))],
+        ...         [('change', 'a', ({'b': 2}, {'d': 0}))])
+        [('change', 'a', ({'b': 1}, {'d': 0}))]
+
+    The items inserting or removing list items, set members or records
+    addressed by :class:`dictdiffer.utils.ListKey` shift the paths of the
+    following items, so the items of such a container are kept in their
+    order once the container is modified that way.  The result can be
+    swapped and reverted like any other diff result, and its values are
+    shared with the composed ones.
+
+    :param diffs: Diff results, e.g. returned by :func:`dictdiffer.diff`.
+    """
+    root = _Overlay()
+    for diff_result in diffs:
+        for action, node, changes in diff_result:
+            if action == CHANGE:
+                # an empty dotted node is the '' key of the destination
+                keys = split_node(node) if node != '' else ('', )
+                changes = tuple(unwrap(value) for value in changes)
+            else:
+                keys = split_node(node)
+                changes = [(key, unwrap(value)) for key, value in changes]
+            root.apply(action, keys, changes)
+
+    return list(merge_items(
+        (action, _node(keys), changes)
+        for action, keys, changes in root.items(())))
+
+
+class _Overlay(object):
+    """Folded changes of a value and of its children.
+
+    A value is either replaced, with its original and new values, or its
+    children are folded separately, or the items changing it are logged in
+    order.
+    """
+
+    __slots__ = ('children', 'indexes', 'list_keys', 'log', 'old', 'new',
+                 'owned')
+
+    def __init__(self):
+        """Create an overlay without changes."""
+        self.children = OrderedDict()
+        # keys of the children by their integer value
+        self.indexes = {}
+        self.list_keys = 0
+        self.log = None
+        self.old = self.new = _MISSING
+        self.owned = False
+
+    @property
+    def replaced(self):
+        """Check if the value is replaced."""
+        return self.old is not _MISSING or self.new is not _MISSING
+
+    @property
+    def changed(self):
+        """Check if the value or its children have changes."""
+        return self.replaced or bool(self.children) or bool(self.log)
+
+    def apply(self, action, keys, changes):
+        """Fold a diff item whose keys are relative to the value."""
+        overlay = self
+        end = len(keys) - 1 if action == CHANGE else len(keys)
+        for depth in range(end + 1):
+            if overlay.replaced:
+                overlay.patch_new(action, keys[depth:], changes)
+                return
+            elif overlay.log is not None:
+                overlay.log.append((action, keys[depth:], changes))
+                return
+            elif depth == end:
+                break
+
+            key = keys[depth]
+            if overlay.conflicts(key) or (
+                    # the key field of a record is changed
+                    action == CHANGE and depth == end - 1 and
+                    isinstance(key, ListKey) and keys[end] == key.field):
+                overlay.start_log()
+                overlay.log.append((action, keys[depth:], changes))
+                return
+            overlay = overlay.child(key)
+
+        if action == CHANGE:
+            key = keys[-1]
+            if overlay.conflicts(key) or isinstance(key, ListKey):
+                overlay.start_log()
+                overlay.log.append((action, keys[end:], changes))
+            else:
+                overlay.child(key).replace(*changes)
+        elif not all(is_name(key) for key, _ in changes) or (
+                action == ADD and any(
+                    overlay.children[key].changed and
+                    not overlay.children[key].replaced
+                    for key, _ in changes if key in overlay.children)):
+            overlay.start_log()
+            overlay.log.append((action, keys[end:], changes))
+        elif action == ADD:
+            for key, value in changes:
+                overlay.child(key).replace(_MISSING, value)
+        else:
+            for key, value in changes:
+                overlay.child(key).replace(value, _MISSING)
+
+    def conflicts(self, key):
+        """Check if a new child could address the same value as another.
+
+        Tuple and unhashable keys, e.g. the index arrays of the items of a
+        NumPy array, are never children.
+        """
+        if isinstance(key, tuple) or not _hashable(key):
+            return True
+        elif isinstance(key, ListKey):
+            return self.list_keys < len(self.children)
+        elif self.list_keys:
+            return True
+        index = key_index(key)
+        return index is not None and self.indexes.get(index, key) != key
+
+    def child(self, key):
+        """Return the overlay of a child."""
+        try:
+            return self.children[key]
+        except KeyError:
+            pass
+        child = self.children[key] = _Overlay()
+        if isinstance(key, ListKey):
+            self.list_keys += 1
+        elif key_index(key) is not None:
+            self.indexes[key_index(key)] = key
+        return child
+
+    def replace(self, old, new):
+        """Fold the replacement of the value."""
+        if self.replaced:
+            # The old value of the first replacement is kept.
+            old = self.old
+        elif self.changed:
+            old = revert([(action, list(keys), changes)
+                          for action, keys, changes in self.items(())], old)
+        self.__init__()
+        self.old = old
+        self.new = new
+
+    def patch_new(self, action, keys, changes):
+        """Apply a diff item to the new value."""
+        if self.new is _MISSING:
+            raise ValueError('can not change the children of a removed '
+                             'value at {0!r}'.format(list(keys)))
+        self.new = patch([(action, list(keys), changes)], self.new,
+                         in_place=self.owned)
+        self.owned = True
+
+    def start_log(self):
+        """Log the following items in order."""
+        self.log = list(self.items(()))
+        self.children.clear()
+        self.indexes.clear()
+        self.list_keys = 0
+
+    def items(self, path):
+        """Yield the diff items of the changes with keys tuples."""
+        if self.log is not None:
+            for action, keys, changes in self.log:
+                yield action, path + tuple(keys), changes
+            return
+
+        for key, child in self.children.items():
+            if not child.replaced:
+                yield from child.items(path + (key, ))
+            elif child.old is _MISSING and child.new is not _MISSING:
+                yield ADD, path, [(key, child.new)]
+            elif child.new is _MISSING and child.old is not _MISSING:
+                yield REMOVE, path, [(key, child.old)]
+            elif child.old is not _MISSING and not (
+                    type(child.old) is type(child.new) and
+                    same_subtree(child.old, child.new)):
+                yield CHANGE, path + (key, ), (child.old, child.new)
+
+
+def _node(keys):
+    """Return the dotted node of keys or their list."""
+    dotted = NodePath.from_keys(keys).dotted()
+    return list(keys) if dotted is None else dotted
+
+
+def _hashable(key):
+    """Check if a key can be a child overlay key."""
+    try:
+        hash(key)
+    except TypeError:
+        return False
+    return True
@@ -0,0 +1,304 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Sub module to store the versions of a document as checkpointed diffs."""
+
+import bisect
+import os
+import pickle
+import re
+from copy import deepcopy
+
+from . import diff, patch, revert, swap
+from .binary import dump, load
+from .compose import compose
+
+
+class DocumentHistory(object):
+    """Versions of a document stored as full checkpoints and diffs.
+
+    Every committed version gets the next version number, starting from 0.
+    The diff from the previous version is stored for every version and a
+    full checkpoint of the document is stored for the first version, every
+    *checkpoint_interval* versions and as soon as the diffs stored since the
+    last checkpoint have more than *max_chain_cost* items.  A version is
+    rebuilt from the nearest checkpoint or from the latest version, by
+    patching the following diffs or by reverting the previous ones, so at
+    most about half a checkpoint interval of diffs are applied.
+
+        >>> from dictdiffer.history import DocumentHistory
+        >>> history = DocumentHistory(checkpoint_interval=2)
+        >>> for value in range(5):
+        ...     history.commit({'a': {'b': value}})
+        0
+        1
+        2
+        3
+        4
+        >>> history.checkpoints
+        [0, 2, 4]
+        >>> history.get(3)
+        {'a': {'b': 3}}
+        >>> history.changes(1, 3)
+        [('change', 'a.b', (1, 3))]
+
+    :param backend: Storage of the checkpoints and of the diffs,
+                    e.g. :class:`FileBackend`.  A new :class:`MemoryBackend`
+                    by default.  The versions already stored are kept.
+    :param checkpoint_interval: Maximum number of versions between two
+                                checkpoints.
+    :param max_chain_cost: Maximum number of diff items stored between two
+                           checkpoints.
+    :param kwargs: Other arguments of :func:`dictdiffer.diff` used to
+                   compare the versions.  The diffs are also reverted, so
+                   *list_keys* and *unordered* should only be given for
+                   lists whose order does not matter.
+    """
+
+    def __init__(self, backend=None, checkpoint_interval=100,
+                 max_chain_cost=10000, **kwargs):
+        """Open the history stored by the backend."""
+        if checkpoint_interval < 1:
+            raise ValueError('checkpoint_interval must be positive')
+        self.backend = MemoryBackend() if backend is None else backend
+        self.checkpoint_interval = checkpoint_interval
+        self.max_chain_cost = max_chain_cost
+        self.diff_kwargs = kwargs
+
+        self.checkpoints = list(self.backend.checkpoints())
+        deltas = self.backend.deltas()
+        self.head = max(self.checkpoints[-1:] + deltas[-1:], default=None)
+        self._head_document = None
+        self._chain_cost = 0
+        if self.checkpoints:
+            for version in range(self.checkpoints[-1] + 1, self.head + 1):
+                self._chain_cost += len(self.backend.read_delta(version))
+
+    def __len__(self):
+        """Return the number of versions."""
+        return 0 if self.head is None else self.head + 1
+
+    def commit(self, document):
+        """Store a new version of the document and return its number."""
+        if self.head is None:
+            version = 0
+            self.backend.write_checkpoint(version, document)
+            self.checkpoints.append(version)
+        else:
+            previous = self._head()
+            delta = list(diff(previous, document, **self.diff_kwargs))
+            version = self.head + 1
+            self.backend.write_delta(version, delta)
+            self._chain_cost += len(delta)
+            if self._chain_cost > self.max_chain_cost or \
+                    version - self.checkpoints[-1] >= \
+                    self.checkpoint_interval:
+                self.backend.write_checkpoint(version, document)
+                self.checkpoints.append(version)
+                self._chain_cost = 0
+
+        self.head = version
+        self._head_document = deepcopy(document)
+        return version
+
+    def get(self, version):
+        """Return a new copy of a version of the document.
+
+        :raises KeyError: when the version does not exist.
+        """
+        self._check(version)
+        index = bisect.bisect_right(self.checkpoints, version)
+        start = self.checkpoints[index - 1]
+        end = self.checkpoints[index] if index < len(self.checkpoints) \
+            else self.head
+
+        if version - start <= end - version or (
+                end not in self.checkpoints and self._head_document is None):
+            document = self.backend.read_checkpoint(start)
+            for number in range(start + 1, version + 1):
+                document = patch(self.backend.read_delta(number), document,
+                                 in_place=True)
+        else:
+            document = self._read(end)
+            for number in range(end, version, -1):
+                document = revert(self.backend.read_delta(number), document,
+                                  in_place=True)
+        return document
+
+    def changes(self, start, end):
+        """Return the diff items from a version to another one.
+
+        The stored diffs are folded by :func:`dictdiffer.compose.compose`.
+        The end version may be older than the start version, the diffs are
+        swapped then.
+        """
+        self._check(start)
+        self._check(end)
+        if start <= end:
+            return compose(*(self.backend.read_delta(number)
+                             for number in range(start + 1, end + 1)))
+        return compose(*(swap(self.backend.read_delta(number), reverse=True)
+                         for number in range(start, end, -1)))
+
+    def versions(self, reverse=False):
+        """Iterate over the version numbers and copies of the document.
+
+        Every version is obtained from the previous one by patching a single
+        diff, or from the next one by reverting it.
+        """
+        if self.head is None:
+            return
+        elif not reverse:
+            document = self.backend.read_checkpoint(0)
+            for number in range(self.head + 1):
+                if number:
+                    document = patch(self.backend.read_delta(number),
+                                     document, in_place=True)
+                yield number, deepcopy(document)
+        else:
+            document = deepcopy(self._head())
+            for number in range(self.head, -1, -1):
+                yield number, deepcopy(document)
+                if number:
+                    document = revert(self.backend.read_delta(number),
+                                      document, in_place=True)
+
+    def _check(self, version):
+        """Raise an error unless the version exists."""
+        if self.head is None or not 0 <= version <= self.head:
+            raise KeyError(version)
+
+    def _head(self):
+        """Return the latest version without copying it."""
+        if self._head_document is None:
+            self._head_document = self.get(self.head)
+        return self._head_document
+
+    def _read(self, version):
+        """Return a copy of the latest version or of a checkpoint."""
+        if version == self.head and self._head_document is not None:
+            return deepcopy(self._head_document)
+        return self.backend.read_checkpoint(version)
+
+
+class MemoryBackend(object):
+    """Storage of a document history in memory.
+
+    The documents and the diffs are copied when they are written and read,
+    so they are not modified by the patched versions.
+    """
+
+    def __init__(self):
+        """Create an empty storage."""
+        self._checkpoints = {}
+        self._deltas = {}
+
+    def checkpoints(self):
+        """Return the sorted version numbers of the checkpoints."""
+        return sorted(self._checkpoints)
+
+    def deltas(self):
+        """Return the sorted version numbers of the diffs."""
+        return sorted(self._deltas)
+
+    def write_checkpoint(self, version, document):
+        """Store the full document of a version."""
+        self._checkpoints[version] = deepcopy(document)
+
+    def read_checkpoint(self, version):
+        """Return a copy of the full document of a version."""
+        return deepcopy(self._checkpoints[version])
+
+    def write_delta(self, version, diff_result):
+        """Store the diff from the previous version to a version."""
+        self._deltas[version] = deepcopy(list(diff_result))
+
+    def read_delta(self, version):
+        """Return a copy of the diff items of a version."""
+        return deepcopy(self._deltas[version])
+
+
+class FileBackend(object):
+    """Storage of a document history in the files of a directory.
+
+    The checkpoints are pickled and the diffs are stored in the format of
+    :mod:`dictdiffer.binary`.  The files are written to temporary files
+    first and then renamed.
+
+    :param directory: Path of the directory, created if needed.
+    """
+
+    _PATTERN = re.compile(r'^(checkpoint|delta)-(\d+)\.(?:pickle|ddif)$')
+
+    def __init__(self, directory):
+        """Create the directory if needed."""
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def checkpoints(self):
+        """Return the sorted version numbers of the checkpoints."""
+        return self._versions('checkpoint')
+
+    def deltas(self):
+        """Return the sorted version numbers of the diffs."""
+        return self._versions('delta')
+
+    def write_checkpoint(self, version, document):
+        """Store the full document of a version."""
+        with _AtomicWriter(self._checkpoint_path(version)) as stream:
+            pickle.dump(document, stream, pickle.HIGHEST_PROTOCOL)
+
+    def read_checkpoint(self, version):
+        """Return the full document of a version."""
+        with open(self._checkpoint_path(version), 'rb') as stream:
+            return pickle.load(stream)
+
+    def write_delta(self, version, diff_result):
+        """Store the diff from the previous version to a version."""
+        with _AtomicWriter(self._delta_path(version)) as stream:
+            dump(diff_result, stream)
+
+    def read_delta(self, version):
+        """Return the diff items of a version."""
+        return list(load(self._delta_path(version)))
+
+    def _versions(self, kind):
+        """Return the sorted version numbers of a kind of files."""
+        versions = []
+        for name in os.listdir(self.directory):
+            match = self._PATTERN.match(name)
+            if match and match.group(1) == kind:
+                versions.append(int(match.group(2)))
+        return sorted(versions)
+
+    def _checkpoint_path(self, version):
+        """Return the path of a checkpoint."""
+        return os.path.join(self.directory,
+                            'checkpoint-{0:08d}.pickle'.format(version))
+
+    def _delta_path(self, version):
+        """Return the path of a diff."""
+        return os.path.join(self.directory,
+                            'delta-{0:08d}.ddif'.format(version))
+
+
+class _AtomicWriter(object):
+    """Binary file renamed to its path when it is closed without error."""
+
+    def __init__(self, path):
+        """Open a temporary file next to the path."""
+        self.path = path
+        self.temporary = path + '.tmp'
+        self.stream = open(self.temporary, 'wb')
+
+    def __enter__(self):
+        """Return the temporary file."""
+        return self.stream
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Rename the temporary file, or remove it after an error."""
+        self.stream.close()
+        if exc_type is None:
+            os.replace(self.temporary, self.path)
+        else:
+            os.remove(self.temporary)
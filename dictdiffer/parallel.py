@@ -0,0 +1,236 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Sub module to compare and patch dictionaries in parallel."""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from . import DICT_TYPES, LIST_TYPES, SET_TYPES, _limit, diff
+from .compiler import compile_patch
+
+# Patch function of a worker process of patch_many().
+_worker_patch = None
+
+
+def parallel_diff(first, second, workers=None, chunks_per_worker=4,
+                  **kwargs):
+    """Compare two dictionaries using a pool of processes.
+
+    The keys common to both dictionaries are split into contiguous chunks
+    of about the same estimated size, which are compared by
+    :func:`dictdiffer.diff` in separate processes.  The results are
+    yielded in the order of the chunks as soon as they are available,
+    followed by the additions and removals of keys found by the calling
+    process, so the diff items are the same and in the same order as the
+    ones of :func:`dictdiffer.diff`.
+
+        >>> from dictdiffer.parallel import parallel_diff
+        >>> list(parallel_diff({'a': 1, 'b': {'c': 2}}, {'b': {'c': 3}},
+        ...                    workers=1))
+        [('change', 'b.c', (2, 3)), ('remove', '', [('a', 1)])]
+
+    Values and the *ignore* and *path_limit* arguments are pickled to be
+    sent to the worker processes.  Values other than dictionaries are
+    compared directly by :func:`dictdiffer.diff`, as well as any values
+    when only one worker is requested.  At most two chunks per worker are
+    submitted ahead of the results consumed, so no more chunks are compared
+    once *max_diffs* items are yielded or the iteration is stopped.
+
+    :param first: The original dictionary.
+    :param second: New dictionary.
+    :param workers: Maximum number of worker processes, the number of CPUs
+                    by default.
+    :param chunks_per_worker: Number of chunks for each worker.  More
+                              chunks balance the load better when the sizes
+                              of the values are not estimated well.
+    :param kwargs: Other arguments of :func:`dictdiffer.diff`.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    items = _parallel_diff(first, second, workers, chunks_per_worker, kwargs)
+    try:
+        yield from _limit(items, kwargs.get('max_diffs'))
+    finally:
+        items.close()
+
+
+def _parallel_diff(first, second, workers, chunks_per_worker, kwargs):
+    """Yield the diff items of :func:`parallel_diff` without a total limit.
+
+    The *max_diffs* argument only limits the items of every chunk.
+    """
+    if workers < 2 or not isinstance(first, DICT_TYPES) or \
+            not isinstance(second, DICT_TYPES):
+        yield from diff(first, second, **kwargs)
+        return
+
+    common = [key for key in first if key in second]
+    chunks = _split_keys(common, [
+        _estimate_size(first[key]) + _estimate_size(second[key])
+        for key in common
+    ], workers * chunks_per_worker)
+
+    # Values are copied anyway when they are sent back by the workers.
+    chunk_kwargs = dict(kwargs)
+    if chunk_kwargs.get('copy', 'deep') == 'deep':
+        chunk_kwargs['copy'] = 'none'
+
+    if len(chunks) > 1:
+        arguments = (({key: first[key] for key in chunk},
+                      {key: second[key] for key in chunk},
+                      chunk_kwargs)
+                     for chunk in chunks)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            try:
+                while True:
+                    for chunk in islice(arguments,
+                                        2 * workers - len(pending)):
+                        pending.append(executor.submit(_diff_chunk, chunk))
+                    if not pending:
+                        break
+                    yield from pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+    elif chunks:
+        yield from diff({key: first[key] for key in common},
+                        {key: second[key] for key in common}, **kwargs)
+
+    yield from diff({key: value for key, value in first.items()
+                     if key not in second},
+                    {key: value for key, value in second.items()
+                     if key not in first}, **kwargs)
+
+
+def patch_many(diff_result, documents, workers=None, in_place=False,
+               chunk_size=100, copy='deep'):
+    """Apply a diff result to many documents using a pool of processes.
+
+    The diff result is compiled by
+    :func:`dictdiffer.compiler.compile_patch` and sent once to every
+    worker process.  The documents are read from the iterable in chunks of
+    *chunk_size*, with a bounded number of chunks in flight, and a pair of
+    the patched document and of ``None`` is yielded for each of them in
+    order.  When a document cannot be patched, the pair is ``None`` and the
+    exception instead, and the other documents are still patched.
+
+        >>> from dictdiffer.parallel import patch_many
+        >>> list(patch_many([('change', 'a.b', (1, 2))],
+        ...                 [{'a': {'b': 1}}, {}], workers=1))
+        [({'a': {'b': 2}}, None), (None, KeyError('a'))]
+
+    The documents are pickled to be sent to the worker processes, so they
+    are never modified in place by them.  The documents are patched by the
+    calling process when only one worker is requested, and a document
+    patched in place may be left partially patched by an error.
+
+    :param diff_result: Changes returned by ``diff``.
+    :param documents: Iterable of the structures to apply the changes to.
+    :param workers: Maximum number of worker processes, the number of CPUs
+                    by default.
+    :param in_place: Apply the changes directly to the documents when they
+                     are patched by the calling process.
+    :param chunk_size: Number of documents sent at once to a worker.
+    :param copy: How the documents are copied, see :func:`dictdiffer.patch`.
+    """
+    if copy not in ('deep', 'shared'):
+        raise ValueError("copy must be one of 'deep' or 'shared'")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    diff_result = list(diff_result)
+    if workers < 2:
+        compiled = compile_patch(diff_result)
+        for document in documents:
+            yield _patch_document(compiled, document, in_place, copy)
+        return
+
+    documents = iter(documents)
+    with multiprocessing.Pool(workers, _init_patch_worker,
+                              (diff_result, )) as pool:
+        pending = deque()
+        while True:
+            chunk = list(islice(documents, chunk_size))
+            if chunk:
+                pending.append(pool.apply_async(_patch_chunk, (chunk, )))
+            if pending and (not chunk or len(pending) >= 2 * workers):
+                yield from pending.popleft().get()
+            elif not chunk:
+                return
+
+
+def _init_patch_worker(diff_result):
+    """Compile the diff result in a worker process."""
+    global _worker_patch
+    _worker_patch = compile_patch(diff_result)
+
+
+def _patch_chunk(documents):
+    """Patch a chunk of documents in a worker process."""
+    # The documents are unpickled copies which can be patched in place.
+    return [_patch_document(_worker_patch, document, True, 'deep')
+            for document in documents]
+
+
+def _patch_document(compiled, document, in_place, copy):
+    """Return the patched document and ``None``, or ``None`` and the error."""
+    try:
+        return compiled(document, in_place=in_place, copy=copy), None
+    except Exception as error:
+        return None, error
+
+
+def _diff_chunk(args):
+    """Return the diff items of a chunk of keys in a worker process."""
+    first, second, kwargs = args
+    return list(diff(first, second, **kwargs))
+
+
+def _split_keys(keys, sizes, count):
+    """Split the keys into about *count* contiguous chunks of similar size.
+
+    A key larger than the target size gets a chunk of its own, so it does
+    not hold up the other keys.
+    """
+    target = sum(sizes) / max(count, 1)
+    chunks = []
+    chunk = []
+    chunk_size = 0
+    for key, size in zip(keys, sizes):
+        if chunk and (size >= target or chunk_size + size > target):
+            chunks.append(chunk)
+            chunk = []
+            chunk_size = 0
+        chunk.append(key)
+        chunk_size += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _estimate_size(value, depth=3, samples=8):
+    """Estimate the number of nodes of a value from a sample of children."""
+    if isinstance(value, DICT_TYPES):
+        children = value.values()
+    elif isinstance(value, LIST_TYPES + SET_TYPES):
+        children = value
+    else:
+        return 1
+
+    length = len(value)
+    if not length:
+        return 1
+    elif depth <= 0:
+        return 1 + length
+
+    step = max(length // samples, 1)
+    sample = list(islice(children, 0, step * samples, step))
+    return 1 + length * sum(
+        _estimate_size(child, depth - 1, samples) for child in sample
+    ) / len(sample)
@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Sub module to summarize differences without keeping their values."""
+
+from . import ADD, CHANGE, HAS_NUMPY, REMOVE, SET_TYPES, diff
+from .utils import dot_lookup
+
+if HAS_NUMPY:
+    import numpy
+
+
+def changed_paths(first, second, **kwargs):
+    """Return the set of paths of the added, removed and changed values.
+
+    The paths are tuples of keys.  Added or removed members of a set are
+    reported with the path of the set.  The items of NumPy arrays compared
+    with *vectorize_arrays* are reported one by one with their indexes, as
+    when they are compared item by item.
+
+        >>> from dictdiffer.stats import changed_paths
+        >>> sorted(changed_paths({'a': {'b': 1, 'c': [1]}},
+        ...                      {'a': {'b': 2, 'c': [1, 2]}, 'd': 0}))
+        [('a', 'b'), ('a', 'c', 1), ('d',)]
+
+    :param first: The original dictionary, ``list`` or ``set``.
+    :param second: New dictionary, ``list`` or ``set``.
+    :param kwargs: Other arguments of :func:`dictdiffer.diff`.
+    """
+    return {path for _, path, _ in _entries(first, second, kwargs)}
+
+
+def diff_stats(first, second, by_depth=False, by_type=False, **kwargs):
+    """Count the added, removed and changed values.
+
+    The objects are compared as by :func:`dictdiffer.diff` but the values
+    are neither copied nor kept.  Each added or removed key or list item
+    and each changed value, including each changed item of the NumPy
+    arrays compared with *vectorize_arrays*, counts once.  The counts are
+    returned in a dictionary, also grouped by the top-level key of their
+    path under ``'keys'`` (``None`` for a change of the objects
+    themselves).
+
+        >>> from dictdiffer.stats import diff_stats
+        >>> stats = diff_stats({'a': {'b': 1, 'c': [1]}, 'e': 1},
+        ...                    {'a': {'b': 2, 'c': [1, 2]}, 'd': 0})
+        >>> stats['add'], stats['remove'], stats['change']
+        (2, 1, 1)
+        >>> stats['keys']['a']
+        {'add': 1, 'remove': 0, 'change': 1}
+
+    :param first: The original dictionary, ``list`` or ``set``.
+    :param second: New dictionary, ``list`` or ``set``.
+    :param by_depth: Also count the values by the length of their path
+                     under ``'depths'``.
+    :param by_type: Also count the values by the name of their type under
+                    ``'types'``.  The new value is used for changes.
+    :param kwargs: Other arguments of :func:`dictdiffer.diff`.
+    """
+    stats = _counters()
+    stats['keys'] = {}
+    if by_depth:
+        stats['depths'] = {}
+    if by_type:
+        stats['types'] = {}
+
+    for action, path, value in _entries(first, second, kwargs):
+        stats[action] += 1
+        groups = [(stats['keys'], path[0] if path else None)]
+        if by_depth:
+            groups.append((stats['depths'], len(path)))
+        if by_type:
+            groups.append((stats['types'], type(value).__name__))
+        for counters, group in groups:
+            try:
+                counters[group][action] += 1
+            except KeyError:
+                counters[group] = _counters()
+                counters[group][action] += 1
+    return stats
+
+
+def _counters():
+    """Return new counters of each action."""
+    return {ADD: 0, REMOVE: 0, CHANGE: 0}
+
+
+def _entries(first, second, kwargs):
+    """Yield the action, path and value of every difference."""
+    kwargs = dict(kwargs, copy='none', dot_notation=False, expand=False)
+    # keys of the *node* argument prefixed to the paths
+    prefix = len(kwargs.get('node') or ())
+    for action, node, changes in diff(first, second, **kwargs):
+        if action == CHANGE and _is_vectorized(node):
+            # The index arrays of the changed items of a NumPy array.
+            path = tuple(node[:-1])
+            for position, value in enumerate(changes[1]):
+                yield action, path + tuple(
+                    int(index[position]) for index in node[-1]), value
+            continue
+        elif action == CHANGE:
+            yield action, tuple(node), changes[1]
+            continue
+
+        for key, value in changes:
+            # The node of a set or of a list adding a set at 0 is looked
+            # up in the first object: paths of moved list items, e.g. with
+            # list_algorithm='myers', hold the indexes of the first list.
+            if key == 0 and isinstance(value, SET_TYPES) and isinstance(
+                    dot_lookup(first, node[prefix:]), SET_TYPES):
+                for member in value:
+                    yield action, tuple(node), member
+            else:
+                yield action, tuple(node) + (key,), value
+
+
+def _is_vectorized(node):
+    """Check if the last path item holds the index arrays of NumPy items."""
+    return HAS_NUMPY and bool(node) and isinstance(node[-1], tuple) and \
+        all(isinstance(index, numpy.ndarray) for index in node[-1])
@@ -0,0 +1,148 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Sub module to diff streams of keyed records larger than memory."""
+
+import heapq
+import pickle
+import tempfile
+from operator import itemgetter
+
+from . import _limit, diff
+
+_END = object()
+
+
+def stream_diff(first, second, batch_size=1000, **kwargs):
+    """Compare two streams of ``(key, record)`` pairs sorted by key.
+
+    The streams are merged by key and compared as two dictionaries mapping
+    the keys to the records, holding only *batch_size* records of each
+    stream in memory.  The records of a batch are compared by
+    :func:`dictdiffer.diff`: changes of the records found in both streams
+    come first, followed by the added and then the removed records.
+
+        >>> from dictdiffer.stream import stream_diff
+        >>> list(stream_diff([(1, {'a': 1}), (2, {'a': 2})],
+        ...                  [(2, {'a': 3}), (3, {'a': 4})]))
+        [('change', [2, 'a'], (2, 3)), ('add', '', [(3, {'a': 4})]), \
+('remove', '', [(1, {'a': 1})])]
+
+    :param first: Iterable of the original records.
+    :param second: Iterable of the new records.
+    :param batch_size: Maximum number of records of each stream compared at
+                       once.
+    :param kwargs: Other arguments of :func:`dictdiffer.diff`.  The streams
+                   are not read further once *max_diffs* items are yielded.
+    :raises ValueError: when the keys of a stream are not strictly
+                        increasing.
+    """
+    return _limit(_stream_diff(first, second, batch_size, kwargs),
+                  kwargs.get('max_diffs'))
+
+
+def _stream_diff(first, second, batch_size, kwargs):
+    """Yield the diff items of :func:`stream_diff` without a total limit."""
+    first = _checked(first)
+    second = _checked(second)
+    first_batch = {}
+    second_batch = {}
+
+    first_key, first_record = next(first, (_END, None))
+    second_key, second_record = next(second, (_END, None))
+    while first_key is not _END or second_key is not _END:
+        if second_key is _END or (
+                first_key is not _END and first_key < second_key):
+            first_batch[first_key] = first_record
+            first_key, first_record = next(first, (_END, None))
+        elif first_key is _END or second_key < first_key:
+            second_batch[second_key] = second_record
+            second_key, second_record = next(second, (_END, None))
+        else:
+            first_batch[first_key] = first_record
+            second_batch[second_key] = second_record
+            first_key, first_record = next(first, (_END, None))
+            second_key, second_record = next(second, (_END, None))
+
+        if len(first_batch) >= batch_size or \
+                len(second_batch) >= batch_size:
+            yield from diff(first_batch, second_batch, **kwargs)
+            first_batch = {}
+            second_batch = {}
+
+    if first_batch or second_batch:
+        yield from diff(first_batch, second_batch, **kwargs)
+
+
+def _checked(pairs):
+    """Yield the pairs checking that their keys are strictly increasing."""
+    previous = _END
+    for key, record in pairs:
+        if previous is not _END and not previous < key:
+            raise ValueError(
+                'keys must be sorted and unique, got {0!r} after {1!r}'.format(
+                    key, previous))
+        previous = key
+        yield key, record
+
+
+def external_sort(pairs, buffer_size=100000, directory=None):
+    """Sort ``(key, record)`` pairs by key using temporary files.
+
+    At most *buffer_size* pairs are held in memory.  Larger inputs are
+    sorted in runs pickled to temporary files, which are merged while the
+    sorted pairs are consumed and deleted afterwards.
+
+        >>> from dictdiffer.stream import external_sort
+        >>> list(external_sort([(3, 'c'), (1, 'a'), (2, 'b')], buffer_size=2))
+        [(1, 'a'), (2, 'b'), (3, 'c')]
+
+    :param pairs: Iterable of ``(key, record)`` pairs.  The records do not
+                  need to be comparable.
+    :param buffer_size: Maximum number of pairs sorted in memory.
+    :param directory: Directory of the temporary files, the default one of
+                      :mod:`tempfile` if ``None``.
+    """
+    runs = []
+    try:
+        buffer = []
+        for pair in pairs:
+            buffer.append(pair)
+            if len(buffer) >= buffer_size:
+                runs.append(_spill(buffer, directory))
+                buffer = []
+        buffer.sort(key=itemgetter(0))
+
+        if not runs:
+            yield from buffer
+            return
+        if buffer:
+            runs.append(_spill(buffer, directory))
+        yield from heapq.merge(*(_load(run) for run in runs),
+                               key=itemgetter(0))
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _spill(buffer, directory):
+    """Write the sorted pairs of the buffer to a temporary file."""
+    buffer.sort(key=itemgetter(0))
+    run = tempfile.TemporaryFile(dir=directory)
+    pickler = pickle.Pickler(run, pickle.HIGHEST_PROTOCOL)
+    for pair in buffer:
+        pickler.dump(pair)
+        # Values shared by several pairs are pickled for each of them.
+        pickler.clear_memo()
+    run.seek(0)
+    return run
+
+
+def _load(run):
+    """Yield the pairs stored in a temporary file."""
+    unpickler = pickle.Unpickler(run)
+    while True:
+        try:
+            yield unpickler.load()
+        except EOFError:
+            return
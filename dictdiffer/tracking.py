@@ -0,0 +1,343 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+"""Sub module to record the changes made to dictionaries, lists and sets."""
+
+from collections.abc import (Mapping, MutableMapping, MutableSequence,
+                             MutableSet)
+from copy import deepcopy
+
+from . import ADD, CHANGE, REMOVE
+
+_MISSING = object()
+
+
+class _Tracked(object):
+    """Common parts of the tracked containers.
+
+    The changes of a tracked container and of all the containers nested in
+    it are appended as diff items to the journal of the outermost one.
+    """
+
+    def _attach(self, parent, key=None):
+        """Record the changes in the journal of the parent.
+
+        Without a parent the container gets a new journal of its own.
+        """
+        self._parent = parent
+        self._key = key
+        self._journal = [] if parent is None else None
+
+    def _wrap(self, key, value):
+        """Return a value to store, containers are tracked too."""
+        if isinstance(value, _Tracked):
+            value = _plain(value)
+        if isinstance(value, Mapping):
+            value = TrackedDict(value)
+        elif isinstance(value, MutableSequence):
+            value = TrackedList(value)
+        elif isinstance(value, MutableSet):
+            value = TrackedSet(value)
+        else:
+            return value
+        value._attach(self, key)
+        return value
+
+    def _record(self, action, key, changes):
+        """Append a diff item to the journal of the outermost container."""
+        path = []
+        node = self
+        while node._parent is not None:
+            path.append(node._parent._key_of(node))
+            node = node._parent
+        path.reverse()
+        if action == CHANGE:
+            node._journal.append((action, path + [key], changes))
+        else:
+            node._journal.append((action, path, [(key, changes)]))
+
+    def checkpoint(self):
+        """Return a checkpoint for :meth:`diff_since`."""
+        self._check_outermost()
+        return len(self._journal)
+
+    def diff_since(self, checkpoint=0):
+        """Return the diff items of the changes made after the checkpoint.
+
+        The items are taken from the journal, without comparing the
+        containers.  They have list paths and patch the container as it was
+        at the checkpoint into its current state.
+
+        :param checkpoint: Value returned by :meth:`checkpoint`, the
+                           creation of the container by default.
+        """
+        self._check_outermost()
+        return self._journal[checkpoint:]
+
+    def _check_outermost(self):
+        """Raise an error unless the container has the journal."""
+        if self._parent is not None:
+            raise ValueError('the journal is kept by the outermost tracked '
+                             'container')
+
+    def __deepcopy__(self, memo):
+        """Return an untracked copy as a new outermost tracked container."""
+        return self.__class__(_plain(self, memo))
+
+
+class TrackedDict(_Tracked, MutableMapping):
+    """Dictionary recording its changes in a journal.
+
+        >>> from dictdiffer.tracking import TrackedDict
+        >>> tracked = TrackedDict({'a': {'b': 1}})
+        >>> checkpoint = tracked.checkpoint()
+        >>> tracked['a']['b'] = 2
+        >>> tracked['c'] = [1]
+        >>> tracked.diff_since(checkpoint)
+        [('change', ['a', 'b'], (1, 2)), ('add', [], [('c', [1])])]
+
+    Nested mappings, mutable sequences and mutable sets are converted to
+    tracked dictionaries, lists and sets when they are stored.  Other values
+    are stored as they are, so changing them in place, e.g. a NumPy array,
+    is not recorded: they must be replaced instead.
+    """
+
+    def __init__(self, data=()):
+        """Track a copy of the data.
+
+        :param data: Initial items.
+        """
+        self._attach(None)
+        self._data = {}
+        for key, value in dict(data).items():
+            self._data[key] = self._wrap(key, value)
+
+    def _key_of(self, child):
+        """Return the key of a nested container."""
+        return child._key
+
+    def __getitem__(self, key):
+        """Return the value of a key."""
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        """Set the value of a key."""
+        if value is self._data.get(key, _MISSING):
+            # e.g. an augmented assignment changed the container in place
+            return
+        value = self._wrap(key, value)
+        if key in self._data:
+            old = self._data[key]
+            self._record(CHANGE, key, (_plain(old), _plain(value)))
+            _detach(old)
+        else:
+            self._record(ADD, key, _plain(value))
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        """Remove a key."""
+        old = self._data.pop(key)
+        self._record(REMOVE, key, _plain(old))
+        _detach(old)
+
+    def __iter__(self):
+        """Iterate over the keys."""
+        return iter(self._data)
+
+    def __len__(self):
+        """Return the number of keys."""
+        return len(self._data)
+
+    def __repr__(self):
+        """Return string representation."""
+        return 'TrackedDict({0!r})'.format(_plain(self))
+
+
+class TrackedList(_Tracked, MutableSequence):
+    """List recording its changes in a journal.
+
+        >>> from dictdiffer.tracking import TrackedList
+        >>> tracked = TrackedList([1, 2])
+        >>> tracked.append(3)
+        >>> del tracked[0]
+        >>> tracked.diff_since()
+        [('add', [], [(2, 3)]), ('remove', [], [(0, 1)])]
+
+    Nested containers are converted to tracked containers when they are
+    stored, as for :class:`TrackedDict`.
+    """
+
+    def __init__(self, data=()):
+        """Track a copy of the data.
+
+        :param data: Initial items.
+        """
+        self._attach(None)
+        self._data = [self._wrap(index, value)
+                      for index, value in enumerate(data)]
+
+    def _key_of(self, child):
+        """Return the index of a nested container."""
+        # The index changes when items are inserted or removed before it.
+        index = child._key
+        if index >= len(self._data) or self._data[index] is not child:
+            for index, value in enumerate(self._data):
+                if value is child:
+                    child._key = index
+                    break
+        return index
+
+    def _index(self, index):
+        """Return the non-negative index of an item."""
+        length = len(self._data)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('list index out of range')
+        return index
+
+    def __getitem__(self, index):
+        """Return an item or a list of items for a slice."""
+        return self._data[index]
+
+    def __setitem__(self, index, value):
+        """Replace an item or a slice."""
+        if isinstance(index, slice):
+            indexes = range(*index.indices(len(self._data)))
+            values = list(value)
+            if index.step not in (None, 1):
+                if len(values) != len(indexes):
+                    raise ValueError(
+                        'attempt to assign sequence of size {0} to extended '
+                        'slice of size {1}'.format(len(values), len(indexes)))
+                for position, item in zip(indexes, values):
+                    self[position] = item
+                return
+            start = indexes.start
+            for position in reversed(indexes):
+                del self[position]
+            for offset, item in enumerate(values):
+                self.insert(start + offset, item)
+            return
+
+        index = self._index(index)
+        if value is self._data[index]:
+            # e.g. an augmented assignment changed the container in place
+            return
+        value = self._wrap(index, value)
+        old = self._data[index]
+        self._record(CHANGE, index, (_plain(old), _plain(value)))
+        _detach(old)
+        self._data[index] = value
+
+    def __delitem__(self, index):
+        """Remove an item or a slice."""
+        if isinstance(index, slice):
+            indexes = range(*index.indices(len(self._data)))
+            for position in sorted(indexes, reverse=True):
+                del self[position]
+            return
+
+        index = self._index(index)
+        old = self._data.pop(index)
+        self._record(REMOVE, index, _plain(old))
+        _detach(old)
+
+    def __len__(self):
+        """Return the number of items."""
+        return len(self._data)
+
+    def insert(self, index, value):
+        """Insert an item before the index."""
+        length = len(self._data)
+        if index < 0:
+            index = max(index + length, 0)
+        index = min(index, length)
+        value = self._wrap(index, value)
+        self._record(ADD, index, _plain(value))
+        self._data.insert(index, value)
+
+    def __eq__(self, other):
+        """Compare the items with the ones of another list."""
+        if isinstance(other, (list, TrackedList)):
+            return list(self._data) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        """Compare the items with the ones of another list."""
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return string representation."""
+        return 'TrackedList({0!r})'.format(_plain(self))
+
+
+class TrackedSet(_Tracked, MutableSet):
+    """Set recording its changes in a journal.
+
+        >>> from dictdiffer.tracking import TrackedSet
+        >>> tracked = TrackedSet({1, 2})
+        >>> tracked.add(3)
+        >>> tracked.discard(1)
+        >>> tracked.diff_since()
+        [('add', [], [(0, {3})]), ('remove', [], [(0, {1})])]
+
+    The members are recorded as in the diff items of sets returned by
+    :func:`dictdiffer.diff`.
+    """
+
+    def __init__(self, data=()):
+        """Track a copy of the data.
+
+        :param data: Initial members.
+        """
+        self._attach(None)
+        self._data = set(data)
+
+    def __contains__(self, value):
+        """Check if a value is a member."""
+        return value in self._data
+
+    def __iter__(self):
+        """Iterate over the members."""
+        return iter(self._data)
+
+    def __len__(self):
+        """Return the number of members."""
+        return len(self._data)
+
+    def add(self, value):
+        """Add a member."""
+        if value not in self._data:
+            self._record(ADD, 0, {deepcopy(value)})
+            self._data.add(value)
+
+    def discard(self, value):
+        """Remove a member if it is present."""
+        if value in self._data:
+            self._record(REMOVE, 0, {deepcopy(value)})
+            self._data.discard(value)
+
+    def __repr__(self):
+        """Return string representation."""
+        return 'TrackedSet({0!r})'.format(_plain(self))
+
+
+def _detach(value):
+    """Give a value removed from its container a journal of its own."""
+    if isinstance(value, _Tracked):
+        value._attach(None)
+
+
+def _plain(value, memo=None):
+    """Return a deep copy of a value with plain containers."""
+    if isinstance(value, TrackedDict):
+        return {key: _plain(item, memo) for key, item in value._data.items()}
+    elif isinstance(value, TrackedList):
+        return [_plain(item, memo) for item in value._data]
+    elif isinstance(value, TrackedSet):
+        return deepcopy(value._data, memo)
+    return deepcopy(value, memo)
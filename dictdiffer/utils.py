@@ -6,11 +6,29 @@
 
 import math
 import sys
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Mapping, MutableSequence, MutableSet, Sequence, Set
+from copy import copy as shallowcopy
+from copy import deepcopy
+from functools import lru_cache
 from itertools import zip_longest
 
 num_types = int, float
 EPSILON = sys.float_info.epsilon
 
+_WILDCARD = object()
+_MATCH = object()
+_UNSET = object()
+
+_LIST_TYPES = (MutableSequence, )
+
+try:
+    import numpy
+    _LIST_TYPES += (numpy.ndarray, )
+except ImportError:  # pragma: no cover
+    numpy = None
+
 
 class WildcardDict(dict):
     """Provide possibility to use special wildcard keys to access values.
@@ -146,6 +164,715 @@ class PathLimit(object):
         return containing.get(self.final_key, False)
 
 
+class LazyCopy(object):
+    """Proxy deferring the deep copy of a diff value until it is accessed.
+
+    The copy is made on the first access of :attr:`value` and kept for all
+    the following ones.  Proxies created by the same ``diff`` call share a
+    deepcopy memo, hence shared sub-objects are copied only once.
+
+        >>> from dictdiffer.utils import LazyCopy
+        >>> source = {'a': [1, 2]}
+        >>> lazy = LazyCopy(source)
+        >>> lazy.value == source, lazy.value is source
+        (True, False)
+    """
+
+    __slots__ = ('_source', '_memo', '_value', '_copied')
+
+    def __init__(self, source, memo=None):
+        """Wrap the value which should be copied later.
+
+        :param source: the original value
+        :param memo: deepcopy memo dictionary shared with other proxies
+        """
+        self._source = source
+        self._memo = {} if memo is None else memo
+        self._value = None
+        self._copied = False
+
+    @property
+    def value(self):
+        """Return the deep copy of the wrapped value."""
+        if not self._copied:
+            self._value = deepcopy(self._source, self._memo)
+            self._copied = True
+            self._source = None
+        return self._value
+
+    def __eq__(self, other):
+        """Compare the copied value."""
+        if isinstance(other, LazyCopy):
+            other = other.value
+        return self.value == other
+
+    def __ne__(self, other):
+        """Compare the copied value."""
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        """Return string representation."""
+        return 'LazyCopy({0!r})'.format(self.value)
+
+
+def unwrap(value):
+    """Return the value of a lazy copy, or the value itself.
+
+    >>> from dictdiffer.utils import LazyCopy, unwrap
+    >>> unwrap(LazyCopy([1])), unwrap(2)
+    ([1], 2)
+    """
+    return value.value if isinstance(value, LazyCopy) else value
+
+
+class PathMatcher(object):
+    """Match key paths against patterns compiled into a trie.
+
+    The trie is walked one path level at a time, so the caller keeps the
+    *states* reached by the parent path and advances them with each key
+    instead of building and looking up the full path.  A ``'*'`` key in a
+    pattern matches any key on the same path level.
+
+        >>> from dictdiffer.utils import PathMatcher
+        >>> matcher = PathMatcher([(('items', '*', 'checksum'), True)])
+        >>> states = matcher.step(matcher.start, 'items')
+        >>> states = matcher.step(states, 0)
+        >>> matcher.match(matcher.step(states, 'checksum'))
+        True
+        >>> matcher.match(matcher.step(states, 'name')) is None
+        True
+    """
+
+    WILDCARD = '*'
+
+    def __init__(self, patterns=()):
+        """Compile the patterns.
+
+        :param patterns: iterable of ``(path, value)`` pairs where *path* is
+                         a sequence of keys
+        """
+        self.root = {}
+        for path, value in patterns:
+            self.add(path, value)
+
+    def add(self, path, value=True):
+        """Add a pattern matching the given path to the trie."""
+        node = self.root
+        for key in path:
+            if isinstance(key, str) and key == self.WILDCARD:
+                key = _WILDCARD
+            node = node.setdefault(key, {})
+        node[_MATCH] = value
+
+    @property
+    def start(self):
+        """Return the states matching the empty path."""
+        return (self.root, ) if self.root else ()
+
+    def step(self, states, key):
+        """Return the states reached from the given states by a key."""
+        result = ()
+        for state in states:
+            child = state.get(key)
+            if child is not None:
+                result += (child, )
+            child = state.get(_WILDCARD)
+            if child is not None:
+                result += (child, )
+        return result
+
+    def walk(self, states, path):
+        """Return the states reached from the given states by a path."""
+        for key in path:
+            if not states:
+                break
+            states = self.step(states, key)
+        return states
+
+    def match(self, states):
+        """Return the value of a pattern ending in the given states.
+
+        Exact keys take precedence over wildcards.  ``None`` is returned
+        when no pattern ends in any of the states.
+        """
+        for state in states:
+            if _MATCH in state:
+                return state[_MATCH]
+        return None
+
+
+class NodePath(object):
+    """Immutable path of keys sharing its prefix with the parent path.
+
+    Extending a path with :meth:`child` is O(1) and does not copy the parent
+    keys.  The list and the dotted notation of a path are only built when
+    requested and they are cached on the path.
+
+        >>> from dictdiffer.utils import NodePath
+        >>> path = NodePath.from_keys(['a']).child('b')
+        >>> path.keys(), path.dotted()
+        (['a', 'b'], 'a.b')
+        >>> path.child(0).dotted() is None
+        True
+    """
+
+    __slots__ = ('parent', 'key', '_keys', '_dotted')
+
+    def __init__(self, parent=None, key=None):
+        """Create a path extending the parent path by one key.
+
+        :param parent: parent path or ``None`` for the empty root path
+        :param key: last key of the path
+        """
+        self.parent = parent
+        self.key = key
+        self._keys = None if parent is not None else ()
+        self._dotted = _UNSET if parent is not None else ''
+
+    @classmethod
+    def from_keys(cls, keys):
+        """Create a path from a sequence of keys."""
+        path = cls()
+        for key in keys:
+            path = cls(path, key)
+        return path
+
+    def child(self, key):
+        """Return the path extended by the given key."""
+        return NodePath(self, key)
+
+    def keys(self):
+        """Return the keys of the path as a new list."""
+        if self._keys is None:
+            keys = []
+            path = self
+            while path.parent is not None:
+                keys.append(path.key)
+                path = path.parent
+            keys.reverse()
+            self._keys = tuple(keys)
+        return list(self._keys)
+
+    def dotted(self):
+        """Return the dotted notation or ``None`` if keys can't be joined."""
+        if self._dotted is _UNSET:
+            keys = self.keys()
+            if all(isinstance(key, str) and '.' not in key for key in keys):
+                self._dotted = '.'.join(keys)
+            else:
+                self._dotted = None
+        return self._dotted
+
+    def __repr__(self):
+        """Return string representation."""
+        return 'NodePath({0!r})'.format(self.keys())
+
+
+class ListKey(object):
+    """Path item addressing the record of a list by its key field value.
+
+    >>> from dictdiffer.utils import ListKey
+    >>> ListKey('id', 2).find([{'id': 1}, {'id': 2}])
+    1
+    """
+
+    __slots__ = ('field', 'value')
+
+    def __init__(self, field, value):
+        """Initialize the path item.
+
+        :param field: key field of the records
+        :param value: value of the key field of the addressed record
+        """
+        self.field = field
+        self.value = value
+
+    def find(self, records):
+        """Return the index of the addressed record in a list."""
+        for index, record in enumerate(records):
+            try:
+                if record[self.field] == self.value:
+                    return index
+            except (KeyError, TypeError, IndexError):
+                pass
+        raise KeyError(self)
+
+    def __eq__(self, other):
+        """Compare the field and value."""
+        if not isinstance(other, ListKey):
+            return NotImplemented
+        return self.field == other.field and self.value == other.value
+
+    def __ne__(self, other):
+        """Compare the field and value."""
+        if not isinstance(other, ListKey):
+            return NotImplemented
+        return not self == other
+
+    def __hash__(self):
+        """Return the hash of the field and value."""
+        return hash((ListKey, self.field, self.value))
+
+    def __repr__(self):
+        """Return string representation."""
+        return 'ListKey({0!r}, {1!r})'.format(self.field, self.value)
+
+
+class ListKeyIndex(object):
+    """Positions of the records of lists by the values of their key fields.
+
+    :meth:`ListKey.find` scans the records of a list.  The index scans a
+    list once per key field, and then finds the records of all the keys of
+    that field by a dictionary lookup.  A list must be forgotten whenever
+    its records are inserted, deleted or replaced, or their key fields
+    change.
+
+        >>> from dictdiffer.utils import ListKey, ListKeyIndex
+        >>> records = [{'id': 1}, {'id': 2}]
+        >>> index = ListKeyIndex()
+        >>> index.find(records, ListKey('id', 2))
+        1
+        >>> records.insert(0, {'id': 0})
+        >>> index.forget(records)
+        >>> index.find(records, ListKey('id', 2))
+        2
+    """
+
+    def __init__(self):
+        """Create an empty index."""
+        # lists by their id, kept alive so that their id is not reused,
+        # and the positions of the key values by key field
+        self._lists = {}
+
+    def find(self, records, key):
+        """Return the index of the record addressed by a list key."""
+        try:
+            fields = self._lists[id(records)][1]
+        except KeyError:
+            fields = {}
+            self._lists[id(records)] = records, fields
+        try:
+            positions = fields[key.field]
+        except KeyError:
+            positions = fields[key.field] = _key_positions(records,
+                                                           key.field)
+        except TypeError:
+            return key.find(records)
+        try:
+            position = positions[key.value]
+            if records[position][key.field] == key.value:
+                return position
+        except (KeyError, TypeError, IndexError):
+            # missing or duplicate values, or values which are not hashable
+            pass
+        return key.find(records)
+
+    def forget(self, records):
+        """Forget the positions of the records of a list."""
+        self._lists.pop(id(records), None)
+
+
+def _key_positions(records, field):
+    """Return the positions of the records by the value of a key field.
+
+    Values shared by several records have no position.
+    """
+    positions = {}
+    for position, record in enumerate(records):
+        try:
+            value = record[field]
+            positions[value] = None if value in positions else position
+        except (KeyError, TypeError, IndexError):
+            pass
+    return positions
+
+
+class PathCache(object):
+    """Containers along the last path looked up in a destination.
+
+    Diff items come sorted by their nodes, so consecutive items mostly
+    share a node or a prefix of it.  Looking up a path only walks the keys
+    following the prefix it shares with the previous one, and the same node
+    is not walked again at all.
+
+        >>> from dictdiffer.utils import PathCache
+        >>> destination = {'a': {'b': [{'c': 1}]}}
+        >>> cache = PathCache(destination)
+        >>> cache.lookup(('a', 'b', '0'))
+        {'c': 1}
+        >>> cache.lookup(('a', 'b'))
+        [{'c': 1}]
+        >>> destination['a']['b'] = [{'c': 2}]
+        >>> cache.invalidate(destination['a'])
+        >>> cache.lookup(('a', 'b', '0'))
+        {'c': 2}
+
+    Changing the items of the last container looked up keeps the cache
+    valid.  Any other container on its path must be invalidated whenever
+    one of its keys is replaced, added or removed.
+
+    With a *copy* function, the source and every container looked up
+    through the cache are replaced by copies the first time they are
+    reached, and the subtrees which are never looked up stay shared with
+    the source.
+
+        >>> from copy import copy
+        >>> cache = PathCache(destination, copy=lambda parent, value: copy(
+        ...     value))
+        >>> cache.lookup(('a', 'b'))[0] = {'c': 3}
+        >>> cache.source, destination
+        ({'a': {'b': [{'c': 3}]}}, {'a': {'b': [{'c': 2}]}})
+
+    :param source: The destination structure.
+    :param copy: Function of the parent container and of a value returning
+                 the copy of the value, or ``None`` to look up the
+                 containers of the source.  The parent is ``None`` for the
+                 source.
+    """
+
+    def __init__(self, source, copy=None):
+        """Create an empty cache of the source."""
+        self._copy = copy
+        #: :class:`ListKeyIndex` of the lists looked up through the cache
+        self.index = ListKeyIndex()
+        # copies by their id, which are not copied again
+        self._owned = {}
+        self.source = self._own(None, source)
+        # keys of the last path and the containers along it
+        self._keys = ()
+        self._values = [self.source]
+
+    def lookup(self, keys):
+        """Return the value of a sequence of keys."""
+        values = self._values
+        cached = self._keys
+        if keys == cached:
+            return values[-1]
+
+        depth = 0
+        end = len(cached) if len(cached) < len(keys) else len(keys)
+        while depth < end and keys[depth] == cached[depth]:
+            depth += 1
+        del values[depth + 1:]
+        value = values[depth]
+        try:
+            for key in keys[depth:] if depth else keys:
+                if type(value) is dict and self._copy is None:
+                    value = value[key]
+                else:
+                    _, value = self._step(value, key)
+                values.append(value)
+        except Exception:
+            self._keys = keys[:len(values) - 1]
+            raise
+        self._keys = keys
+        return value
+
+    def _step(self, parent, key):
+        """Return the key and the value of a container item."""
+        key, value = lookup_key(parent, key, self.index)
+        if self._copy is not None and id(value) not in self._owned:
+            copied = self._own(parent, value)
+            if copied is not value:
+                parent[key] = value = copied
+        return key, value
+
+    def _own(self, parent, value):
+        """Return the copy of a value to modify."""
+        if self._copy is None:
+            return value
+        value = self._copy(parent, value)
+        self._owned[id(value)] = value
+        return value
+
+    def invalidate(self, container):
+        """Forget the path below a container whose keys are modified."""
+        for depth, value in enumerate(self._values):
+            if value is container:
+                del self._values[depth + 1:]
+                self._keys = self._keys[:depth]
+                return
+
+
+def split_node(node):
+    """Return the keys of a node as a tuple.
+
+    Dotted strings are split once and the result is cached.
+
+        >>> from dictdiffer.utils import split_node
+        >>> split_node('a.b'), split_node(['a', 0]), split_node('')
+        (('a', 'b'), ('a', 0), ())
+    """
+    if node is None or node == '' or node == []:
+        return ()
+    elif isinstance(node, str):
+        return _split_dotted(node)
+    elif isinstance(node, list):
+        return tuple(node)
+    raise TypeError('lookup must be string or list')
+
+
+@lru_cache(maxsize=1024)
+def _split_dotted(node):
+    """Split a dotted node."""
+    return tuple(node.split('.'))
+
+
+def lookup_key(value, key, index=None):
+    """Return the key used to index the value and the indexed item.
+
+    The keys of lists are converted to integers and the records addressed
+    by a :class:`ListKey` are found by their key field.
+
+        >>> from dictdiffer.utils import ListKey, lookup_key
+        >>> lookup_key(['a', 'b'], '1')
+        (1, 'b')
+        >>> lookup_key([{'id': 3}], ListKey('id', 3))
+        (0, {'id': 3})
+
+    :param value: The container.
+    :param key: A key of a diff node.
+    :param index: :class:`ListKeyIndex` finding the records, or ``None``
+                  to scan the list.
+    """
+    if isinstance(key, ListKey):
+        key = key.find(value) if index is None else index.find(value, key)
+    elif isinstance(value, MutableSequence):
+        key = int(key)
+    return key, value[key]
+
+
+def key_index(key):
+    """Return the list index a diff key may stand for, or ``None``.
+
+    >>> from dictdiffer.utils import key_index
+    >>> key_index(1), key_index('1'), key_index('a')
+    (1, 1, None)
+    """
+    if isinstance(key, int):
+        return key
+    elif isinstance(key, str):
+        try:
+            return int(key)
+        except ValueError:
+            pass
+    return None
+
+
+def is_name(key):
+    """Check if a diff key can only be a key of a dictionary.
+
+    >>> from dictdiffer.utils import is_name
+    >>> is_name('a'), is_name('1')
+    (True, False)
+    """
+    return not isinstance(key, ListKey) and key_index(key) is None
+
+
+def _walk(source, keys):
+    """Return the value of a sequence of keys."""
+    value = source
+    for key in keys:
+        _, value = lookup_key(value, key)
+    return value
+
+
+def merge_items(diff_result):
+    """Merge consecutive additions or removals on the same node.
+
+    They are applied together, so that list items are inserted or deleted
+    by slices.  The item lists of the diff result are not modified.
+
+        >>> from dictdiffer.utils import merge_items
+        >>> list(merge_items([('add', 'a', [(0, 'x')]),
+        ...                   ('add', 'a', [(1, 'y')]),
+        ...                   ('change', 'b', (1, 2))]))
+        [('add', 'a', [(0, 'x'), (1, 'y')]), ('change', 'b', (1, 2))]
+
+    :param diff_result: Changes returned by ``diff``.
+    """
+    pending = None
+    for action, node, changes in diff_result:
+        if pending is not None:
+            if action == pending[0] and node == pending[1]:
+                pending[2].extend(changes)
+                continue
+            yield pending
+            pending = None
+        if action == 'change':
+            yield action, node, changes
+        else:
+            pending = action, node, list(changes)
+    if pending is not None:
+        yield pending
+
+
+def add_items(dest, changes, index=None):
+    """Add the items of an `add` diff item to a container.
+
+        >>> from dictdiffer.utils import add_items
+        >>> dest = ['a', 'd']
+        >>> add_items(dest, [(1, 'b'), (2, 'c')])
+        >>> dest
+        ['a', 'b', 'c', 'd']
+
+    :param dest: The container of the diff node.
+    :param changes: The added items.
+    :param index: :class:`ListKeyIndex` forgetting the list, if any.
+    """
+    kind = type(dest)
+    if kind is dict:
+        for key, value in changes:
+            dest[key] = unwrap(value)
+        return
+    elif kind is set:
+        for _, value in changes:
+            dest |= unwrap(value)
+        return
+
+    # Subclasses of list may override insert().
+    runs = _index_runs(changes, 1) if kind is list else None
+    if runs is not None:
+        for start, _, values in runs:
+            dest[start:start] = [unwrap(value) for value in values]
+        if index is not None:
+            index.forget(dest)
+        return
+
+    for key, value in changes:
+        value = unwrap(value)
+        if isinstance(dest, _LIST_TYPES):
+            if isinstance(key, ListKey):
+                dest.append(value)
+            else:
+                dest.insert(key, value)
+        elif isinstance(dest, MutableSet):
+            dest |= value
+        else:
+            dest[key] = value
+    if index is not None:
+        index.forget(dest)
+
+
+def remove_items(dest, changes, index=None):
+    """Remove the items of a `remove` diff item from a container.
+
+        >>> from dictdiffer.utils import ListKey, remove_items
+        >>> dest = [{'id': 1}, {'id': 2}, {'id': 3}]
+        >>> remove_items(dest, [(ListKey('id', 3), {'id': 3}),
+        ...                     (ListKey('id', 1), {'id': 1})])
+        >>> dest
+        [{'id': 2}]
+
+    :param dest: The container of the diff node.
+    :param changes: The removed items.
+    :param index: :class:`ListKeyIndex` finding the removed records and
+                  then forgetting the list, if any.
+    """
+    kind = type(dest)
+    if kind is dict:
+        for key, _ in changes:
+            del dest[key]
+        return
+    elif kind is set:
+        for _, value in changes:
+            dest -= unwrap(value)
+        return
+
+    runs = _index_runs(changes, -1) if kind is list else None
+    if runs is not None:
+        for start, stop, _ in runs:
+            if start >= len(dest):
+                raise IndexError('list assignment index out of range')
+            del dest[stop:start + 1]
+        if index is not None:
+            index.forget(dest)
+        return
+
+    if index is not None and isinstance(dest, _LIST_TYPES) and \
+            all(isinstance(key, ListKey) for key, _ in changes):
+        # The records are found before any is deleted, unless a key
+        # addresses the same record as another one.
+        positions = {index.find(dest, key) for key, _ in changes}
+        if len(positions) == len(changes):
+            for position in sorted(positions, reverse=True):
+                del dest[position]
+            index.forget(dest)
+            return
+
+    for key, value in changes:
+        if isinstance(dest, MutableSet):
+            value = unwrap(value)
+            dest -= value
+        elif isinstance(key, ListKey):
+            del dest[key.find(dest)]
+        else:
+            del dest[key]
+    if index is not None:
+        index.forget(dest)
+
+
+def item_key(dest, key, index=None):
+    """Return the key of the item of a container changed by a diff item.
+
+        >>> from dictdiffer.utils import item_key
+        >>> item_key(['a', 'b'], '1'), item_key({'1': 'a'}, '1')
+        (1, '1')
+
+    :param dest: The container of the changed item.
+    :param key: The last key of the diff node.
+    :param index: :class:`ListKeyIndex` finding the records, or ``None``
+                  to scan the list.
+    """
+    if isinstance(key, ListKey):
+        return key.find(dest) if index is None else index.find(dest, key)
+    elif isinstance(key, tuple) and numpy is not None and \
+            isinstance(dest, numpy.ndarray):
+        # index arrays of a vectorized array diff
+        return key
+    elif isinstance(dest, _LIST_TYPES):
+        return int(key)
+    return key
+
+
+def _index_runs(changes, step):
+    """Group the items of a list by runs of consecutive indexes.
+
+    The runs are lists of the first index, the last index and the values.
+    Return ``None`` unless all the indexes are non-negative integers.
+
+        >>> from dictdiffer.utils import _index_runs
+        >>> _index_runs([(4, 'c'), (3, 'b'), (1, 'a')], -1)
+        [[4, 3, ['c', 'b']], [1, 1, ['a']]]
+    """
+    runs = []
+    for key, value in changes:
+        if type(key) is not int or key < 0:
+            return None
+        if runs and key == runs[-1][1] + step:
+            runs[-1][1] = key
+            runs[-1][2].append(value)
+        else:
+            runs.append([key, key, [value]])
+    return runs
+
+
+def copy_container(parent, value):
+    """Return a shallow copy of a container to patch.
+
+    The items of NumPy arrays are views sharing the data of the array, so
+    they are not copied again.
+
+    :param parent: The container of the value, or ``None``.
+    :param value: The container to copy.
+    """
+    if numpy is not None and isinstance(parent, numpy.ndarray):
+        return value
+    return shallowcopy(value)
+
+
 def create_dotted_node(node):
     """Create the *dotted node* notation for the dictdiffer.diff patches.
 
@@ -206,6 +933,43 @@ def nested_hash(obj):
             return hash(tuple(map(nested_hash, sorted(obj.items()))))
 
 
+def structural_hash(obj):
+    """Create a hash of nested, mutable data structures.
+
+    Unlike :func:`nested_hash` the items of dictionaries and sets do not need
+    to be sortable and values comparing equal (e.g. ``1`` and ``1.0`` or
+    dictionaries with different key orders) always get the same hash.
+    Different values may collide, e.g. a list and a tuple with the same
+    items, so an equality check is still needed to tell them apart.
+
+        >>> from dictdiffer.utils import structural_hash
+        >>> first = structural_hash({'a': [1], 'b': 2})
+        >>> first == structural_hash({'b': 2.0, 'a': [1]})
+        True
+    """
+    cls = obj.__class__
+    # Fast paths for the builtin containers, which are never hashable.
+    if cls is dict:
+        return hash(frozenset([(key, structural_hash(value))
+                               for key, value in obj.items()]))
+    elif cls is list:
+        return hash(tuple([structural_hash(value) for value in obj]))
+
+    try:
+        return hash(obj)
+    except TypeError:
+        pass
+    if isinstance(obj, Mapping):
+        return hash(frozenset(
+            (key, structural_hash(value)) for key, value in obj.items()))
+    elif isinstance(obj, Set):
+        return hash(frozenset(obj))
+    elif isinstance(obj, Sequence):
+        return hash(tuple(map(structural_hash, obj)))
+    # Unknown unhashable values share a bucket per type.
+    return hash(type(obj))
+
+
 def dot_lookup(source, lookup, parent=False):
     """Allow you to reach dictionary items with string or list lookup.
 
@@ -230,7 +994,6 @@ def dot_lookup(source, lookup, parent=False):
     if lookup is None or lookup == '' or lookup == []:
         return source
 
-    value = source
     if isinstance(lookup, str):
         keys = lookup.split('.')
     elif isinstance(lookup, list):
@@ -241,11 +1004,289 @@ def dot_lookup(source, lookup, parent=False):
     if parent:
         keys = keys[:-1]
 
-    for key in keys:
-        if isinstance(value, list):
-            key = int(key)
-        value = value[key]
-    return value
+    return _walk(source, keys)
+
+
+def same_subtree(first, second):
+    """Check cheaply if two values are known to have no differences.
+
+    Identity is tested first and then equality, which for builtin containers
+    runs at C speed without visiting the children from Python.  Values whose
+    equality is not a plain boolean (e.g. NumPy arrays) or too deep to be
+    compared are never considered the same, so the caller falls back to a
+    full comparison.
+
+        >>> same_subtree({'a': [1, 2]}, {'a': [1, 2]})
+        True
+        >>> same_subtree({'a': [1, 2]}, {'a': [1, 3]})
+        False
+    """
+    if first is second:
+        return True
+    try:
+        return bool(first == second)
+    except (TypeError, ValueError, RecursionError):
+        return False
+
+
+def run_steps(steps):
+    """Run a generator to its end and return its return value.
+
+    The long computations of this module are written as generators yielding
+    once per step of work, so :func:`dictdiffer.aio.adiff` can give control
+    back to the event loop while they run.
+
+        >>> from dictdiffer.utils import run_steps
+        >>> def steps():
+        ...     yield
+        ...     return 42
+        >>> run_steps(steps())
+        42
+    """
+    try:
+        while True:
+            next(steps)
+    except StopIteration as stop:
+        return stop.value
+
+
+def myers_opcodes(first, second, equal=same_subtree, max_cost=1024):
+    """Return opcodes turning one sequence into another with fewest edits.
+
+    The sequences are aligned with the Myers algorithm after stripping their
+    common prefix and suffix, so items do not need to be hashable.  The
+    opcodes have the same format as the ones of
+    :meth:`difflib.SequenceMatcher.get_opcodes`.
+
+        >>> from dictdiffer.utils import myers_opcodes
+        >>> myers_opcodes([{'a': 1}, 2, 3], [0, {'a': 1}, 3])
+        [('insert', 0, 0, 0, 1), ('equal', 0, 1, 1, 2), \
+('delete', 1, 2, 2, 2), ('equal', 2, 3, 2, 3)]
+
+    When more than *max_cost* edits are needed, the sequences are first
+    split on the items occurring once in each of them, in the same order
+    (as done by the patience diff), and the parts between these items are
+    aligned separately.  Only a part still needing too many edits without
+    such items is reported as a single ``'replace'`` opcode, so the result
+    is not always the shortest one.
+
+        >>> myers_opcodes([1, 2, 'x', 3, 4], [0, 1, 'x', 4, 5], max_cost=2)
+        [('insert', 0, 0, 0, 1), ('equal', 0, 1, 1, 2), \
+('delete', 1, 2, 2, 2), ('equal', 2, 3, 2, 3), ('delete', 3, 4, 3, 3), \
+('equal', 4, 5, 3, 4), ('insert', 5, 5, 4, 5)]
+
+    :param first: the original sequence
+    :param second: the new sequence
+    :param equal: function comparing an item of each sequence
+    :param max_cost: maximum number of edits searched by the Myers algorithm
+                     for a part of the sequences, or ``None`` for no limit.
+                     The time and memory needed grow with the square of
+                     this value.
+    """
+    return run_steps(_myers_opcodes(first, second, equal, max_cost))
+
+
+def _myers_opcodes(first, second, equal, max_cost):
+    """Yield once per compared or matched item and return the opcodes.
+
+    See :func:`myers_opcodes`.
+    """
+    len_first, len_second = len(first), len(second)
+
+    matches = []
+    # Ranges of the sequences still to align, and lists of matches of the
+    # parts already aligned, in reverse order.
+    stack = [(0, len_first, 0, len_second)]
+    while stack:
+        part = stack.pop()
+        if part.__class__ is list:
+            matches.extend(part)
+            continue
+
+        start_first, end_first, start_second, end_second = part
+        while (start_first < end_first and start_second < end_second and
+               equal(first[start_first], second[start_second])):
+            yield
+            matches.append((start_first, start_second))
+            start_first += 1
+            start_second += 1
+        suffix = []
+        while (end_first > start_first and end_second > start_second and
+               equal(first[end_first - 1], second[end_second - 1])):
+            yield
+            end_first -= 1
+            end_second -= 1
+            suffix.append((end_first, end_second))
+        suffix.reverse()
+
+        middle = yield from _myers_matches(
+            first, second, start_first, start_second, end_first - start_first,
+            end_second - start_second, equal, max_cost)
+        if middle is not None:
+            matches.extend(middle)
+            matches.extend(suffix)
+            continue
+
+        stack.append(suffix)
+        anchors = yield from _unique_matches(
+            first, second, start_first, end_first, start_second, end_second,
+            equal)
+        # The parts between the anchors are aligned in order.
+        for i, j in reversed(anchors):
+            stack.append((i + 1, end_first, j + 1, end_second))
+            stack.append([(i, j)])
+            end_first, end_second = i, j
+        if anchors:
+            stack.append((start_first, end_first, start_second, end_second))
+
+    opcodes = []
+    i = j = 0
+    for match_i, match_j in matches + [(len_first, len_second)]:
+        yield
+        if i < match_i and j < match_j:
+            opcodes.append(('replace', i, match_i, j, match_j))
+        elif i < match_i:
+            opcodes.append(('delete', i, match_i, j, j))
+        elif j < match_j:
+            opcodes.append(('insert', i, i, j, match_j))
+        if match_i < len_first:
+            if opcodes and opcodes[-1][0] == 'equal':
+                _, i1, _, j1, _ = opcodes.pop()
+            else:
+                i1, j1 = match_i, match_j
+            opcodes.append(('equal', i1, match_i + 1, j1, match_j + 1))
+        i, j = match_i + 1, match_j + 1
+    return opcodes
+
+
+def _myers_matches(first, second, offset_first, offset_second, len_first,
+                   len_second, equal, max_cost):
+    """Yield once per compared or matched item and return the matches.
+
+    The pairs of the shortest edit script of ``len_first`` and
+    ``len_second`` items starting at the offsets are returned, or ``None``
+    when more than ``max_cost`` edits are needed.
+    """
+    # trace[d][(k + d) // 2] is the furthest x reached on diagonal k = x - y
+    # with d edits.
+    trace = []
+    previous = None
+    for cost in range(len_first + len_second + 1):
+        if max_cost is not None and cost > max_cost:
+            return None
+        current = [0] * (cost + 1)
+        for index in range(cost + 1):
+            diagonal = 2 * index - cost
+            if cost == 0:
+                x = 0
+            elif index == 0 or (
+                    index != cost and previous[index - 1] < previous[index]):
+                x = previous[index]
+            else:
+                x = previous[index - 1] + 1
+            y = x - diagonal
+            yield
+            while (x < len_first and y < len_second and
+                   equal(first[offset_first + x],
+                         second[offset_second + y])):
+                yield
+                x += 1
+                y += 1
+            current[index] = x
+            if x >= len_first and y >= len_second:
+                trace.append(current)
+                break
+        else:
+            trace.append(current)
+            previous = current
+            continue
+        break
+
+    matches = []
+    x, y = len_first, len_second
+    for cost in range(len(trace) - 1, 0, -1):
+        previous = trace[cost - 1]
+        diagonal = x - y
+        index = (diagonal + cost) // 2
+        if index == 0 or (
+                index != cost and previous[index - 1] < previous[index]):
+            # insertion of second[y]
+            previous_x = previous[index]
+            previous_y = previous_x - diagonal - 1
+            middle_x = previous_x
+        else:
+            # deletion of first[x]
+            previous_x = previous[index - 1]
+            previous_y = previous_x - diagonal + 1
+            middle_x = previous_x + 1
+        while x > middle_x:
+            yield
+            x -= 1
+            y -= 1
+            matches.append((offset_first + x, offset_second + y))
+        x, y = previous_x, previous_y
+    while x > 0:
+        yield
+        x -= 1
+        y -= 1
+        matches.append((offset_first + x, offset_second + y))
+
+    matches.reverse()
+    return matches
+
+
+def _unique_matches(first, second, start_first, end_first, start_second,
+                    end_second, equal):
+    """Return the longest chain of pairs of items unique in both ranges.
+
+    The items are bucketed by their :func:`structural_hash` and the pairs
+    of equal items occurring once in each range are kept when their indexes
+    increase in both sequences.  Yield once per hashed item.
+    """
+    def buckets(sequence, start, end):
+        found = {}
+        for index in range(start, end):
+            yield
+            try:
+                key = structural_hash(sequence[index])
+            except RecursionError:
+                continue
+            found[key] = index if key not in found else None
+        return found
+
+    first_buckets = yield from buckets(first, start_first, end_first)
+    second_buckets = yield from buckets(second, start_second, end_second)
+    pairs = []
+    for key, i in first_buckets.items():
+        j = second_buckets.get(key)
+        if i is not None and j is not None:
+            yield
+            if equal(first[i], second[j]):
+                pairs.append((i, j))
+    pairs.sort()
+
+    # Longest increasing subsequence of the second indexes: tails[n] is the
+    # pair ending the chains of n + 1 pairs with the smallest last index.
+    tails = []
+    tail_indexes = []
+    links = []
+    for position, (_, j) in enumerate(pairs):
+        length = bisect_left(tail_indexes, j)
+        links.append(tails[length - 1] if length else None)
+        if length == len(tails):
+            tails.append(position)
+            tail_indexes.append(j)
+        else:
+            tails[length] = position
+            tail_indexes[length] = j
+
+    chain = []
+    position = tails[-1] if tails else None
+    while position is not None:
+        chain.append(pairs[position])
+        position = links[position]
+    chain.reverse()
+    return chain
 
 
 def are_different(first, second, tolerance, absolute_tolerance=None):
@@ -274,3 +1315,101 @@ def are_different(first, second, tolerance, absolute_tolerance=None):
         )
     # we got different values
     return True
+
+
+def different_items(first, second, tolerance, absolute_tolerance=None):
+    """Return the indexes of the different items of two NumPy arrays.
+
+    The items are compared with the rules of :func:`are_different` for all
+    of them at once: two NaN values are not different and, as the items of
+    ``float64`` arrays are the only NumPy numbers which are Python floats,
+    only the items of two ``float64`` arrays are compared with the
+    tolerances as by :func:`math.isclose`.  The indexes
+    are returned as a tuple of arrays, one for each dimension, as by
+    :func:`numpy.nonzero`.  ``None`` is returned when the arrays do not have
+    the same shape or their items are arbitrary Python objects.
+
+        >>> import numpy
+        >>> from dictdiffer.utils import different_items
+        >>> different_items(numpy.array([1.0, 2.0, 3.0]),
+        ...                 numpy.array([1.0, 2.5, 3.0]), 0.1)
+        (array([1]),)
+    """
+    import numpy
+
+    if (first.shape != second.shape or first.ndim == 0 or
+            first.dtype.kind in 'OV' or second.dtype.kind in 'OV'):
+        return None
+
+    try:
+        different = first != second
+        if first.dtype == numpy.float64 and second.dtype == numpy.float64:
+            with numpy.errstate(invalid='ignore', over='ignore'):
+                limit = numpy.maximum(
+                    (tolerance or 0) *
+                    numpy.maximum(numpy.abs(first), numpy.abs(second)),
+                    absolute_tolerance or 0)
+                different &= ~((numpy.abs(first - second) <= limit) &
+                               numpy.isfinite(first) &
+                               numpy.isfinite(second))
+        if first.dtype.kind in 'fc' and second.dtype.kind in 'fc':
+            different &= ~(numpy.isnan(first) & numpy.isnan(second))
+    except TypeError:
+        return None
+    return numpy.nonzero(different)
+
+
+def multiset_difference(first, second, equal=same_subtree):
+    """Return the indexes of the unmatched items of two sequences.
+
+    The sequences are compared as multisets: the items are bucketed by their
+    :func:`structural_hash` and every item of *first* is matched with an
+    equal item of *second* which was not matched yet.  A tuple of the
+    unmatched indexes of *first* and of *second* is returned.
+
+        >>> from dictdiffer.utils import multiset_difference
+        >>> multiset_difference([{'a': 1}, 2, {'a': 1}], [2, {'a': 1}, 3])
+        ([2], [2])
+
+    :param first: the original sequence
+    :param second: the new sequence
+    :param equal: function comparing an item of each sequence
+    """
+    return run_steps(_multiset_difference(first, second, equal))
+
+
+def _multiset_difference(first, second, equal):
+    """Yield once per hashed or compared item and return the indexes.
+
+    See :func:`multiset_difference`.
+    """
+    def bucket(item):
+        try:
+            return structural_hash(item)
+        except RecursionError:
+            return None
+
+    buckets = {}
+    for index, item in enumerate(second):
+        yield
+        buckets.setdefault(bucket(item), deque()).append(index)
+
+    matched = set()
+    unmatched = []
+    for index, item in enumerate(first):
+        yield
+        candidates = buckets.get(bucket(item))
+        if candidates:
+            for position, candidate in enumerate(candidates):
+                yield
+                if equal(item, second[candidate]):
+                    matched.add(candidate)
+                    del candidates[position]
+                    break
+            else:
+                unmatched.append(index)
+        else:
+            unmatched.append(index)
+
+    return unmatched, [index for index in range(len(second))
+                       if index not in matched]
@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from dictdiffer import _TICK, _diff, diff, patch
+from dictdiffer.aio import adiff, apatch
+
+
+class AsyncTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.first = {'key{0}'.format(i): {'values': list(range(i))}
+                      for i in range(30)}
+        self.first['removed'] = 1
+        self.second = {'key{0}'.format(i): {'values': list(range(1, i + 1))}
+                       for i in range(30)}
+        self.second['added'] = [1]
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_with_counter(self, coroutine):
+        """Run the coroutine and count the switches to another task."""
+        switches = []
+
+        async def count():
+            while True:
+                switches.append(None)
+                await asyncio.sleep(0)
+
+        counter = self.loop.create_task(count())
+        result = self.loop.run_until_complete(coroutine)
+        counter.cancel()
+        return result, len(switches)
+
+    def test_ticks(self):
+        items = list(_diff(self.first, self.second, tick=10))
+        self.assertIn(_TICK, items)
+        self.assertEqual([item for item in items if item is not _TICK],
+                         list(diff(self.first, self.second)))
+
+    def test_ticks_without_children(self):
+        first = {'a': [], 'b': [{'x': i} for i in range(100)]}
+        second = {'a': [{'x': i} for i in range(100)], 'b': []}
+        for kwargs in ({}, {'expand': True}, {'list_algorithm': 'myers'},
+                       {'unordered': ['a', 'b']}, {'prune': True}):
+            items = list(_diff(first, second, tick=10, **kwargs))
+            self.assertGreaterEqual(items.count(_TICK), 20)
+            self.assertEqual([item for item in items if item is not _TICK],
+                             list(diff(first, second, **kwargs)))
+
+        first = list(range(100))
+        second = list(range(1, 101))
+        for kwargs in ({'list_algorithm': 'myers'}, {'unordered': ['']},
+                       {'list_algorithm': 'myers', 'list_max_cost': 1}):
+            items = list(_diff(first, second, tick=10, **kwargs))
+            self.assertGreaterEqual(items.count(_TICK), 10)
+            self.assertEqual([item for item in items if item is not _TICK],
+                             list(diff(first, second, **kwargs)))
+
+    def test_adiff(self):
+        expected = list(diff(self.first, self.second))
+        result, switches = self.run_with_counter(
+            adiff(self.first, self.second, batch_size=10))
+        self.assertEqual(result, expected)
+        self.assertGreater(switches, 10)
+
+    def test_adiff_executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            result = self.loop.run_until_complete(adiff(
+                self.first, self.second, executor=executor, offload_size=40,
+                dot_notation=False))
+        self.assertEqual(result, list(diff(self.first, self.second,
+                                           dot_notation=False)))
+
+    def test_adiff_max_diffs(self):
+        with ThreadPoolExecutor(2) as executor:
+            for count in (0, 1, 5, 100):
+                result = self.loop.run_until_complete(adiff(
+                    self.first, self.second, executor=executor,
+                    offload_size=40, max_diffs=count))
+                self.assertEqual(result, list(diff(
+                    self.first, self.second, max_diffs=count)))
+
+    def test_apatch(self):
+        diffed = list(diff(self.first, self.second, expand=True))
+        result, switches = self.run_with_counter(
+            apatch(diffed, self.first, batch_size=5))
+        self.assertEqual(result, self.second)
+        self.assertGreater(switches, len(diffed) // 5 - 1)
+        self.assertNotEqual(self.first, self.second)
+
+        with ThreadPoolExecutor(1) as executor:
+            result = self.loop.run_until_complete(
+                apatch(diffed, self.first, executor=executor))
+        self.assertEqual(result, patch(diffed, self.first))
+
+        destination = patch([], self.first)
+        result = self.loop.run_until_complete(
+            apatch(diffed, destination, in_place=True))
+        self.assertIs(result, destination)
+        self.assertEqual(destination, self.second)
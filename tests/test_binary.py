@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+import io
+import os
+import pickle
+import tempfile
+import unittest
+
+from dictdiffer import diff, patch
+from dictdiffer.binary import MAGIC, DiffWriter, _varint, dump, load, loads
+
+
+class BinaryTests(unittest.TestCase):
+    def setUp(self):
+        self.first = {'a': {'b': [1, 2, 3], 'c': {1, 2}}, 'd.e': 1,
+                      'f': {'g': 'x' * 100}}
+        self.second = {'a': {'b': [1, 5], 'c': {2, 3}}, 'd.e': 2,
+                       'f': {'g': 'y' * 100}, 'h': None}
+        self.result = list(diff(self.first, self.second))
+
+    def test_roundtrip(self):
+        stream = io.BytesIO()
+        self.assertEqual(dump(self.result, stream), len(self.result))
+        self.assertEqual(list(loads(stream.getvalue())), self.result)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'diff.bin')
+            with open(filename, 'wb') as output:
+                DiffWriter(output).write_all(
+                    diff(self.first, self.second, copy='lazy', expand=True))
+            self.assertEqual(patch(load(filename), self.first), self.second)
+            self.assertEqual(list(load(filename)),
+                             list(diff(self.first, self.second, expand=True)))
+
+    def test_interned_paths(self):
+        items = [('change', ['a', 'b', i], (i, i + 1)) for i in range(3)]
+        items += [('add', 'a', [(i, i)]) for i in range(100)]
+        stream = io.BytesIO()
+        dump(items, stream)
+        data = stream.getvalue()
+        self.assertEqual(data.count(pickle.dumps('a', 3)), 1)
+        self.assertLess(len(data),
+                        sum(len(pickle.dumps(item)) for item in items))
+        decoded = list(loads(data))
+        self.assertEqual(decoded, items)
+        decoded[0][1].append('x')
+        self.assertEqual(decoded[1][1], ['a', 'b', 1])
+
+    def test_dotted_keys(self):
+        first = {'a': {'b': 1}, 'a.b': {}}
+        second = {'a': {'b': 2}, 'a.b': {'x': 1}}
+        result = list(diff(first, second))
+        self.assertIn(('add', ['a.b'], [('x', 1)]), result)
+        stream = io.BytesIO()
+        dump(result, stream)
+        self.assertEqual(list(loads(stream.getvalue())), result)
+        self.assertEqual(patch(loads(stream.getvalue()), first), second)
+
+        items = [('change', [1, 'c'], (1, 2)),
+                 ('change', [True, 'c'], (2, 3))]
+        stream = io.BytesIO()
+        dump(items, stream)
+        decoded = list(loads(stream.getvalue()))
+        self.assertEqual(decoded, items)
+        self.assertIs(decoded[1][1][0], True)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            list(loads(b'PK\x03\x04'))
+        with self.assertRaises(ValueError):
+            list(loads(MAGIC + b'\x7f'))
+        stream = io.BytesIO()
+        dump(self.result, stream)
+        with self.assertRaises(ValueError):
+            list(loads(stream.getvalue()[:-3]))
+
+    def test_varint(self):
+        self.assertEqual(_varint(0), b'\x00')
+        self.assertEqual(_varint(127), b'\x7f')
+        self.assertEqual(_varint(300), b'\xac\x02')
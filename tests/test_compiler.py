@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+import unittest
+from copy import deepcopy
+
+from dictdiffer import diff, patch
+from dictdiffer.compiler import compile_patch
+from dictdiffer.utils import ListKey
+
+
+class CompilePatchTests(unittest.TestCase):
+    def setUp(self):
+        self.first = {'a': {'b': [1, 2, 3], 'c': {1, 2}, 'd': 'e'},
+                      'f': [{'g': 1}, {'g': 2}], 'h.i': 0}
+        self.second = {'a': {'b': [1, 4], 'c': {2, 3}, 'j': {'k': []}},
+                       'f': [{'g': 3}, {'g': 2}, {'g': 4}], 'h.i': 1}
+
+    def test_patch(self):
+        for kwargs in ({}, {'expand': True}, {'dot_notation': False},
+                       {'list_algorithm': 'myers'}):
+            result = list(diff(self.first, self.second, **kwargs))
+            compiled = compile_patch(result)
+            assert compiled(self.first) == self.second
+            assert compiled(self.first, copy='shared') == self.second
+            assert self.first['a']['b'] == [1, 2, 3]
+            assert compiled(self.first) == patch(result, self.first)
+
+    def test_copies(self):
+        compiled = compile_patch(diff(self.first, self.second))
+        first = compiled(self.first)
+        second = compiled(self.first, copy='shared')
+        assert first['a']['j'] is not second['a']['j']
+        assert second['f'][1] is self.first['f'][1]
+
+        first = deepcopy(self.first)
+        assert compiled(first, in_place=True) is first
+        assert first == self.second
+        self.assertRaises(ValueError, compiled, self.first, copy='none')
+
+    def test_source(self):
+        compiled = compile_patch([('change', 'a.0.b', (1, 2)),
+                                  ('change', 'a.0.c', (1, 2)),
+                                  ('add', 'a', [(1, {})]),
+                                  ('change', 'a.0.b', (2, 3))])
+        assert compiled.source().splitlines() == [
+            'def _patch(d, o, i):',
+            "    v1 = d['a']",
+            "    v2 = _lookup_key(v1, '0')[1]",
+            "    v2['b'] = _c0",
+            "    v2['c'] = _c1",
+            '    _add_items(v1, [(1, _deepcopy(_c2))], i)',
+            "    v3 = _lookup_key(v1, '0')[1]",
+            "    v3['b'] = _c3",
+        ]
+        assert compiled({'a': [{'b': 1, 'c': 1}]}) == \
+            {'a': [{'b': 3, 'c': 2}, {}]}
+        assert compile_patch([]).source() == 'def _patch(d, o, i):\n    pass'
+
+    def test_list_keys(self):
+        first = {'a': [{'id': 1, 'b': 1}, {'id': 2, 'b': 2}]}
+        second = {'a': [{'id': 2, 'b': 3}, {'id': 3, 'b': 4}]}
+        result = list(diff(first, second, list_keys={'a': 'id'}))
+        compiled = compile_patch(result)
+        assert compiled(first) == second
+        assert compiled(first, copy='shared') == second
+        assert ListKey('id', 2) in result[0][1]
+
+    def test_list_key_index(self):
+        compiled = compile_patch([
+            ('change', ['a', ListKey('id', 1), 'id'], (1, 0)),
+            ('change', ['a', ListKey('id', 2), 'b'], (2, 3)),
+            ('add', 'a', [(ListKey('id', 1), {'id': 1})]),
+            ('change', ['a', ListKey('id', 1), 'b'], (None, 4))])
+        assert compiled.source().splitlines() == [
+            'def _patch(d, o, i):',
+            "    v1 = d['a']",
+            '    v2 = v1[i.find(v1, _c0)]',
+            "    v2['id'] = _c1",
+            '    i.forget(v1)',
+            '    v3 = v1[i.find(v1, _c2)]',
+            "    v3['b'] = _c3",
+            '    v1.append(_deepcopy(_c4))',
+            '    i.forget(v1)',
+            '    v4 = v1[i.find(v1, _c5)]',
+            "    v4['b'] = _c6",
+        ]
+        first = {'a': [{'id': 2, 'b': 2}, {'id': 1, 'b': 1}]}
+        second = {'a': [{'id': 2, 'b': 3}, {'id': 0, 'b': 1},
+                        {'id': 1, 'b': 4}]}
+        assert compiled(first) == second
+        assert compiled(first, copy='shared') == second
@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+import unittest
+
+from dictdiffer import HAS_NUMPY, diff, patch, revert, swap
+from dictdiffer.compose import compose
+from dictdiffer.utils import LazyCopy, ListKey
+
+
+class ComposeTests(unittest.TestCase):
+    def assert_composed(self, *documents, **kwargs):
+        diffs = [list(diff(first, second, **kwargs))
+                 for first, second in zip(documents, documents[1:])]
+        result = compose(*diffs)
+        self.assertEqual(patch(result, documents[0]), documents[-1])
+        self.assertEqual(revert(result, documents[-1]), documents[0])
+        self.assertLessEqual(len(result), sum(len(items) for items in diffs))
+        return result
+
+    def test_cancel(self):
+        result = self.assert_composed({'a': 1}, {'a': 1, 'b': {'c': 1}},
+                                      {'a': 1, 'b': {'c': 2}}, {'a': 1})
+        self.assertEqual(result, [])
+        result = self.assert_composed({'a': 1}, {'a': 2}, {'a': 1})
+        self.assertEqual(result, [])
+
+    def test_collapse(self):
+        result = self.assert_composed({'a': {'b': 1}, 'c': 0},
+                                      {'a': {'b': 2}, 'c': 0},
+                                      {'a': {'b': 3}, 'c': 1},
+                                      {'a': {'b': 4}, 'c': 1})
+        self.assertEqual(result, [('change', 'a.b', (1, 4)),
+                                  ('change', 'c', (0, 1))])
+
+    def test_remove_and_add(self):
+        result = self.assert_composed({'a': 1}, {}, {'a': 2})
+        self.assertEqual(result, [('change', 'a', (1, 2))])
+        result = self.assert_composed({}, {'a': {'b': 1}},
+                                      {'a': {'b': 2, 'c': [1]}})
+        self.assertEqual(result, [('add', '', [('a', {'b': 2, 'c': [1]})])])
+
+    def test_replaced_parent(self):
+        first = {'a': {'b': {'c': 1, 'd': 1}}}
+        result = self.assert_composed(first,
+                                      {'a': {'b': {'c': 2, 'd': 1}}},
+                                      {'a': {'b': {'c': 2}}},
+                                      {'a': []})
+        self.assertEqual(result, [('change', 'a', (first['a'], []))])
+        self.assertEqual(first, {'a': {'b': {'c': 1, 'd': 1}}})
+
+    def test_lists(self):
+        self.assert_composed({'a': [1, 2, 3]}, {'a': [1, 5, 3]},
+                             {'a': [0, 1, 5, 3, 4]}, {'a': [0, 6, 5]},
+                             {'a': [7, 6, 5]})
+        self.assert_composed({'a': [1, 2, 3]}, {'a': [3, 1, 2]},
+                             {'a': [1, 2]}, list_algorithm='myers')
+        self.assert_composed({'a': [{'b': 1}]}, {'a': [{'b': 2}]},
+                             {'a': []}, expand=True)
+        self.assert_composed({'a': {1, 2}}, {'a': {2, 3}}, {'a': {1}})
+
+    def test_list_keys(self):
+        result = compose([('change', ['a', ListKey('id', 1), 'b'], (1, 2))],
+                         [('change', ['a', ListKey('id', 1), 'id'], (1, 3))],
+                         [('change', ['a', ListKey('id', 3), 'b'], (2, 4))])
+        self.assertEqual(patch(result, {'a': [{'id': 1, 'b': 1}]}),
+                         {'a': [{'id': 3, 'b': 4}]})
+
+    @unittest.skipIf(not HAS_NUMPY, 'NumPy is not installed')
+    def test_vectorized_arrays(self):
+        import numpy as np
+        documents = [{'a': np.array([1, 2, 3]), 'b': 1},
+                     {'a': np.array([1, 5, 3]), 'b': 2},
+                     {'a': np.array([7, 5, 3]), 'b': 2}]
+        diffs = [list(diff(first, second, vectorize_arrays=True))
+                 for first, second in zip(documents, documents[1:])]
+        result = compose(*diffs)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(patch(result, documents[0])['a'].tolist(),
+                         [7, 5, 3])
+        self.assertEqual(revert(result, documents[2])['a'].tolist(),
+                         [1, 2, 3])
+        self.assertEqual(result[-1], ('change', 'b', (1, 2)))
+
+    def test_lazy_values(self):
+        value = {'c': 1}
+        result = compose([('add', 'a', [('b', LazyCopy(value))])],
+                         [('change', 'a.b.c', (1, 2))])
+        self.assertEqual(result, [('add', 'a', [('b', {'c': 2})])])
+        self.assertEqual(value, {'c': 1})
+        self.assertEqual(list(swap(result)),
+                         [('remove', 'a', [('b', {'c': 2})])])
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, compose, [('remove', '', [('a', {})])],
+                          [('change', 'a.b', (1, 2))])
@@ -3,14 +3,16 @@
 # SPDX-FileCopyrightText: 2017-2019 ETH Zurich, Swiss Data Science Center, Jiri Kuncar.
 # SPDX-License-Identifier: MIT
 
+import sys
 import unittest
 from collections import OrderedDict
 from collections.abc import MutableMapping, MutableSequence
 
 import pytest
 
-from dictdiffer import HAS_NUMPY, diff, dot_lookup, patch, revert, swap
-from dictdiffer.utils import PathLimit
+from dictdiffer import (HAS_NUMPY, are_equal, diff, dot_lookup, patch, revert,
+                        swap)
+from dictdiffer.utils import ListKey, PathLimit
 
 
 class DictDifferTests(unittest.TestCase):
@@ -78,6 +80,42 @@ class DictDifferTests(unittest.TestCase):
         second['a']['b'] = 'c'  # result MUST stay unchanged
         assert result[0][2][1]['b'] == 'b'
 
+    def test_copy_none(self):
+        value = {'b': [1, 2]}
+        (_, _, [(_, added)]), = diff({}, {'a': value}, copy='none')
+        assert added is value
+
+    def test_copy_shallow(self):
+        value = {'b': [1, 2]}
+        (_, _, [(_, added)]), = diff({}, {'a': value}, copy='shallow')
+        assert added == value
+        assert added is not value
+        assert added['b'] is value['b']
+
+    def test_copy_deep_shared_memo(self):
+        shared = [1, 2]
+        first = {'a': 1}
+        second = {'a': 2, 'b': shared, 'c': shared}
+        result = list(diff(first, second))
+        assert result == [('change', 'a', (1, 2)),
+                          ('add', '', [('b', [1, 2]), ('c', [1, 2])])]
+        (_, _, [(_, b), (_, c)]) = result[1]
+        assert b is c
+        assert b is not shared
+
+    def test_copy_lazy(self):
+        first = {'a': 'a'}
+        second = {'a': {'b': 'b'}, 'c': [1, 2]}
+        result = list(diff(first, second, copy='lazy'))
+        assert result == [('change', 'a', ('a', {'b': 'b'})),
+                          ('add', '', [('c', [1, 2])])]
+        assert result[0][2][1].value is not second['a']
+        assert patch(result, first) == second
+        assert revert(result, second) == first
+
+    def test_copy_invalid(self):
+        self.assertRaises(ValueError, diff, {}, {}, copy='full')
+
     def test_tolerance(self):
         first = {'a': 'b'}
         second = {'a': 'c'}
@@ -227,6 +265,32 @@ class DictDifferTests(unittest.TestCase):
 
         assert res == diffed
 
+    def test_path_limit_change_continues(self):
+        first = {'author': {'name': 'Doe'}, 'title': 'A', 'id': 1}
+        second = {'author': {'name': 'Doe'}, 'title': 'B', 'year': 2}
+        p = PathLimit([('author',)])
+        diffed = list(diff(first, second, path_limit=p))
+        assert diffed == [('change', 'title', ('A', 'B')),
+                          ('add', '', [('year', 2)]),
+                          ('remove', '', [('id', 1)])]
+
+    def test_deep_nesting(self):
+        depth = 5 * sys.getrecursionlimit()
+        first = second = 'a'
+        for _ in range(depth):
+            first = {'x': first}
+        for _ in range(depth):
+            second = {'x': second}
+        second_leaf = second
+        for _ in range(depth - 1):
+            second_leaf = second_leaf['x']
+        second_leaf['x'] = 'b'
+
+        (action, node, values), = diff(first, second, dot_notation=False)
+        assert action == 'change'
+        assert node == ['x'] * depth
+        assert values == ('a', 'b')
+
     def test_expand_addition(self):
         first = {}
         second = {'foo': 'bar', 'apple': 'banana'}
@@ -397,6 +461,26 @@ class DictDifferTests(unittest.TestCase):
 
         assert len(list(diff(a, b, ignore={3, 4}))) == 0
 
+    def test_ignore_wildcard(self):
+        first = {'items': [{'id': 1, 'checksum': 'a'},
+                           {'id': 2, 'checksum': 'b'}],
+                 'meta': {'x': {'checksum': 'c'}, 'y': {'checksum': 'd'}}}
+        second = {'items': [{'id': 1, 'checksum': 'x'},
+                            {'id': 3, 'checksum': 'y'}],
+                  'meta': {'x': {'checksum': 'e'}, 'y': {'checksum': 'f'}}}
+        diffed = list(diff(first, second, ignore=['items.*.checksum',
+                                                  ('meta', '*')]))
+        assert diffed == [('change', ['items', 1, 'id'], (2, 3))]
+
+        diffed = list(diff(first, second, ignore={'*'}))
+        assert diffed == []
+
+    def test_ignore_with_node(self):
+        first = {'b': 1, 'c': 2}
+        second = {'b': 2, 'c': 3}
+        diffed = list(diff(first, second, node=['a'], ignore=['a.b']))
+        assert diffed == [('change', 'a.c', (2, 3))]
+
     def test_ignore_with_ignorecase(self):
         class IgnoreCase(set):
             def __contains__(self, key):
@@ -471,6 +555,183 @@ class DictDifferTests(unittest.TestCase):
         first = {1: [1]}
         assert len(list(diff(first, first))) == 0
 
+    def test_prune(self):
+        shared = {'b': [1, 2, {'c': 3}]}
+        first = {'a': shared, 'x': {'y': [1, 2]}, 'z': 1.0}
+        second = {'a': shared, 'x': {'y': [1, 3]}, 'z': 1.0 + 1e-17}
+        assert list(diff(first, second, prune=True)) == \
+            list(diff(first, second))
+        assert list(diff(first, second, prune=True)) == [
+            ('change', ['x', 'y', 1], (2, 3))]
+        assert list(diff(first, first, prune=True)) == []
+
+    def test_prune_records(self):
+        first = [{'id': i, 'value': i * 1.5, 'tags': [i]} for i in range(50)]
+        second = [dict(record) for record in first]
+        second[3]['value'] += 1
+        second[7]['tags'] = [7, 8]
+        second[9]['value'] += 1e-17  # within the default tolerance
+        second[11]['value'] = first[11]['value'] = float('nan')
+        second.append({'id': 50})
+        assert list(diff(first, second, prune=True)) == \
+            list(diff(first, second)) == [
+                ('change', [3, 'value'], (4.5, 5.5)),
+                ('add', [7, 'tags'], [(1, 8)]),
+                ('add', '', [(50, {'id': 50})]),
+            ]
+
+    def test_prune_nan(self):
+        value = float('nan')
+        assert list(diff({'a': [value]}, {'a': [value]}, prune=True)) == []
+        assert list(diff({'a': [value]}, {'a': [float('nan')]},
+                         prune=True)) == []
+
+    @unittest.skipIf(not HAS_NUMPY, 'NumPy is not installed')
+    def test_prune_numpy_array(self):
+        import numpy as np
+        first = {'a': np.array([1, 2, 3])}
+        second = {'a': np.array([1, 2, 4])}
+        assert list(diff(first, second, prune=True)) == [
+            ('change', ['a', 2], (3, 4))]
+
+    def test_list_myers(self):
+        first = {'a': [1, 2, 3, 4, 5]}
+        second = {'a': [0, 1, 3, 4, 6, 5]}
+        diffed = list(diff(first, second, list_algorithm='myers'))
+        assert diffed == [('remove', 'a', [(1, 2)]),
+                          ('add', 'a', [(0, 0), (4, 6)])]
+        assert patch(diffed, first) == second
+        assert revert(diffed, second) == first
+
+    def test_list_myers_replace(self):
+        first = [{'id': 1, 'v': 'a'}, {'id': 2}, {'id': 3}]
+        second = [{'id': 0}, {'id': 1, 'v': 'b'}, {'id': 3}, {'id': 4}]
+        diffed = list(diff(first, second, list_algorithm='myers',
+                           expand=True))
+        assert diffed == [('change', [0, 'id'], (1, 0)),
+                          ('remove', [0], [('v', 'a')]),
+                          ('change', [1, 'id'], (2, 1)),
+                          ('add', [1], [('v', 'b')]),
+                          ('add', '', [(3, {'id': 4})])]
+        assert patch(diffed, first) == second
+        assert revert(diffed, second) == first
+
+    def test_list_myers_head_insert(self):
+        first = list(range(1000))
+        second = ['x'] + first
+        diffed = list(diff(first, second, list_algorithm='myers'))
+        assert diffed == [('add', '', [(0, 'x')])]
+
+    def test_list_myers_max_cost(self):
+        first = list(range(2000))
+        second = list(first)
+        for index in range(1950, 0, -50):
+            second[index] = -index
+            del second[index - 20]
+        diffed = list(diff(first, second, list_algorithm='myers',
+                           list_max_cost=10))
+        assert diffed == list(diff(first, second, list_algorithm='myers'))
+        assert len(diffed) == 40
+        assert diffed[-1][0] == 'remove' and len(diffed[-1][2]) == 39
+        assert patch(diffed, first) == second
+        assert revert(diffed, second) == first
+
+        diffed = list(diff([1, 2, 1, 2], [2, 1, 2, 1],
+                           list_algorithm='myers', list_max_cost=1))
+        assert diffed == [('change', [0], (1, 2)), ('change', [1], (2, 1)),
+                          ('change', [2], (1, 2)), ('change', [3], (2, 1))]
+
+    def test_list_algorithm_invalid(self):
+        self.assertRaises(ValueError, diff, [], [], list_algorithm='lcs')
+
+    def test_list_keys(self):
+        first = {'users': [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'},
+                           {'id': 3, 'name': 'c'}]}
+        second = {'users': [{'id': 4, 'name': 'd'}, {'id': 2, 'name': 'b'},
+                            {'id': 1, 'name': 'x'}]}
+        diffed = list(diff(first, second, list_keys={'users': 'id'}))
+        self.assertEqual(diffed, [
+            ('change', ['users', ListKey('id', 1), 'name'], ('a', 'x')),
+            ('add', 'users', [(ListKey('id', 4), {'id': 4, 'name': 'd'})]),
+            ('remove', 'users', [(ListKey('id', 3), {'id': 3, 'name': 'c'})]),
+        ])
+
+        # Reordering the records is not a difference.
+        self.assertEqual(list(diff(first, {'users': first['users'][::-1]},
+                                   list_keys={'users': 'id'})), [])
+
+    def test_list_keys_patch(self):
+        first = {'users': [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]}
+        second = {'users': [{'id': 3, 'name': 'c'}, {'id': 1, 'name': 'x'}]}
+        diffed = list(diff(first, second, list_keys={'users': 'id'}))
+
+        # The records are found by key on a reordered destination.
+        target = {'users': [{'id': 2, 'name': 'b'}, {'id': 1, 'name': 'a'}]}
+        patched = patch(diffed, target)
+        self.assertEqual(patched, {'users': [{'id': 1, 'name': 'x'},
+                                             {'id': 3, 'name': 'c'}]})
+        self.assertEqual(revert(diffed, patched),
+                         {'users': [{'id': 1, 'name': 'a'},
+                                    {'id': 2, 'name': 'b'}]})
+
+    def test_list_keys_patch_key_field(self):
+        first = {'a': [{'id': 1, 'b': 1}, {'id': 2, 'b': 2}]}
+        diffed = [('change', ['a', ListKey('id', 2), 'id'], (2, 0)),
+                  ('change', ['a', ListKey('id', 1), 'id'], (1, 2)),
+                  ('change', ['a', ListKey('id', 2), 'b'], (1, 3)),
+                  ('remove', ['a', ListKey('id', 0)], [('id', 0)]),
+                  ('add', ['a', ListKey('id', 2)], [('c', 4)]),
+                  ('add', 'a', [(ListKey('id', 1), {'id': 1})]),
+                  ('remove', 'a', [(ListKey('id', 1), {'id': 1}),
+                                   (ListKey('id', 2), {'id': 2})])]
+        second = {'a': [{'b': 2}]}
+        self.assertEqual(patch(diffed, first), second)
+        self.assertEqual(patch(diffed, first, copy='shared'), second)
+
+    def test_list_keys_wildcard(self):
+        first = {'a': {'items': [{'k': 'x', 'v': 1}]},
+                 'b': {'items': [{'k': 'y', 'v': 1}]}}
+        second = {'a': {'items': [{'k': 'x', 'v': 2}]},
+                  'b': {'items': [{'k': 'y', 'v': 1}]}}
+        diffed = list(diff(first, second, list_keys={('*', 'items'): 'k'}))
+        self.assertEqual(diffed, [
+            ('change', ['a', 'items', ListKey('k', 'x'), 'v'], (1, 2)),
+        ])
+        self.assertEqual(patch(diffed, first), second)
+
+    def test_unordered(self):
+        first = {'bag': [{'a': 1}, {'b': 2}, {'a': 1}, [3]]}
+        second = {'bag': [[3], {'a': 1}, {'c': 4}, {'b': 2}]}
+        diffed = list(diff(first, second, unordered=['bag']))
+        self.assertEqual(diffed, [
+            ('remove', 'bag', [(2, {'a': 1})]),
+            ('add', 'bag', [(2, {'c': 4})]),
+        ])
+        patched = patch(diffed, first)
+        self.assertEqual(patched, {'bag': [{'a': 1}, {'b': 2}, {'c': 4},
+                                           [3]]})
+        self.assertEqual(revert(diffed, patched), first)
+
+        self.assertEqual(list(diff(first, {'bag': first['bag'][::-1]},
+                                   unordered=['bag'])), [])
+
+    def test_unordered_root_and_wildcard(self):
+        self.assertEqual(list(diff([{'a': 1}, 1.0], [1, {'a': 1}],
+                                   unordered=[''])), [])
+        first = {'x': {'l': [1, 2]}, 'y': {'l': [2, 3]}}
+        second = {'x': {'l': [2, 1]}, 'y': {'l': [3, 2, 2]}}
+        self.assertEqual(list(diff(first, second, unordered=[('*', 'l')])),
+                         [('add', 'y.l', [(2, 2)])])
+
+    def test_list_keys_fallback(self):
+        first = {'users': [{'id': 1}, {'id': 1}]}
+        second = {'users': [{'id': 1}, {'id': 2}]}
+        self.assertEqual(list(diff(first, second, list_keys={'users': 'id'})),
+                         list(diff(first, second)))
+        first = {'users': [{'id': 1}, 2]}
+        self.assertEqual(list(diff(first, second, list_keys={'users': 'id'})),
+                         list(diff(first, second)))
+
     @unittest.skipIf(not HAS_NUMPY, 'NumPy is not installed')
     def test_numpy_array(self):
         """Compare NumPy arrays (#68)."""
@@ -480,6 +741,106 @@ class DictDifferTests(unittest.TestCase):
         result = list(diff(first, second))
         assert result == [('change', [2], (3, 4))]
 
+    @unittest.skipIf(not HAS_NUMPY, 'NumPy is not installed')
+    def test_numpy_vectorize_arrays(self):
+        import numpy as np
+        first = {'a': np.array([[1.0, 2.0], [np.nan, 4.0]])}
+        second = {'a': np.array([[1.0, 2.5], [np.nan, 5.0]])}
+        (action, node, (old, new)), = diff(first, second,
+                                           vectorize_arrays=True)
+        assert action == 'change'
+        assert node[0] == 'a'
+        np.testing.assert_array_equal(node[1][0], [0, 1])
+        np.testing.assert_array_equal(node[1][1], [1, 1])
+        np.testing.assert_array_equal(old, [2.0, 4.0])
+        np.testing.assert_array_equal(new, [2.5, 5.0])
+
+        diffed = list(diff(first, second, vectorize_arrays=True))
+        patched = patch(diffed, first)
+        np.testing.assert_array_equal(patched['a'], second['a'])
+        np.testing.assert_array_equal(revert(diffed, patched)['a'],
+                                      first['a'])
+
+        assert list(diff(first, first, vectorize_arrays=True)) == []
+
+    @unittest.skipIf(not HAS_NUMPY, 'NumPy is not installed')
+    def test_numpy_vectorize_arrays_tolerance(self):
+        import numpy as np
+        first = np.array([1.0, 100.0, np.inf])
+        second = np.array([1.05, 101.0, -np.inf])
+        (_, node, _), = diff(first, second, tolerance=0.02,
+                             vectorize_arrays=True)
+        np.testing.assert_array_equal(node[0][0], [0, 2])
+        (_, node, _), = diff(first, second, tolerance=None,
+                             absolute_tolerance=0.1, vectorize_arrays=True)
+        np.testing.assert_array_equal(node[0][0], [1, 2])
+
+        # As item by item, only float64 items are compared with tolerances.
+        for first, second in (
+                (np.array([1000000, 5]), np.array([1000001, 5])),
+                (np.array([1e6, 5, np.nan], dtype=np.float32),
+                 np.array([1e6 + 1, 5, np.nan], dtype=np.float32)),
+                (np.array([1e6, 5, np.nan]), np.array([1e6 + 1, 5, np.nan]))):
+            expected = list(diff(first, second, tolerance=1e-3))
+            result = list(diff(first, second, tolerance=1e-3,
+                               vectorize_arrays=True))
+            assert len(expected) == len(result)
+            assert len(result) == (first.dtype != np.float64)
+            for (_, node, _), (_, vectorized, _) in zip(expected, result):
+                assert node == [int(vectorized[-1][0][0])]
+
+    @unittest.skipIf(not HAS_NUMPY, 'NumPy is not installed')
+    def test_numpy_vectorize_arrays_shape(self):
+        import numpy as np
+        first = {'a': np.array([1, 2, 3])}
+        second = {'a': np.array([1, 2])}
+        (action, node, (old, new)), = diff(first, second,
+                                           vectorize_arrays=True)
+        assert (action, node) == ('change', 'a')
+        np.testing.assert_array_equal(old, first['a'])
+        np.testing.assert_array_equal(new, second['a'])
+        diffed = list(diff(first, second, vectorize_arrays=True))
+        np.testing.assert_array_equal(patch(diffed, first)['a'], second['a'])
+
+        # Arrays of Python objects are still compared item by item.
+        assert list(diff(np.array([{'a': 1}]), np.array([{'a': 2}]),
+                         vectorize_arrays=True)) == [
+            ('change', [0, 'a'], (1, 2))]
+
+    def test_max_diffs(self):
+        first = {'a': [1, 2, 3], 'b': 1, 'c': {'d': 1}}
+        second = {'a': [4, 5, 6], 'b': 2, 'c': {'d': 2}, 'e': 1}
+        full = list(diff(first, second))
+        for count in range(len(full) + 2):
+            assert list(diff(first, second, max_diffs=count)) == \
+                full[:count]
+
+    def test_are_equal(self):
+        assert are_equal({'a': [1, {'b': 2}]}, {'a': [1, {'b': 2}]})
+        assert not are_equal({'a': [1, {'b': 2}]}, {'a': [1, {'b': 3}]})
+        assert not are_equal({'a': 1}, {'a': 1, 'b': 2})
+        assert are_equal({'a': 1.0}, {'a': 1.05}, tolerance=0.1)
+        assert are_equal({'a': float('nan')}, {'a': float('nan')})
+        assert are_equal({'a': 1, 'b': 2}, {'a': 2, 'b': 2}, ignore={'a'})
+        assert are_equal({'a': {'b': [1]}}, {'a': {'b': [1]}},
+                         path_limit=PathLimit([('a',)]))
+        assert not are_equal({'a': {'b': [1]}}, {'a': {'b': [2]}},
+                             path_limit=PathLimit([('a',)]))
+
+    def test_are_equal_stops_early(self):
+        class Exploding(dict):
+            def items(self):
+                raise AssertionError('visited')
+
+            def __iter__(self):
+                raise AssertionError('visited')
+
+        first = {'a': 1, 'z': Exploding(x=1)}
+        second = {'a': 2, 'z': Exploding(x=2)}
+        assert not are_equal(first, second)
+        assert list(diff(first, second, max_diffs=1)) == [
+            ('change', 'a', (1, 2))]
+
     def test_dict_subclasses(self):
         class Foo(dict):
             pass
@@ -686,6 +1047,59 @@ class DiffPatcherTests(unittest.TestCase):
         patched_in_place = patch(changes, first, in_place=True)
         assert first == patched_in_place
 
+    def test_shared_copy_patch(self):
+        first = {'a': {'b': [{'c': 1}, {'d': 2}]}, 'e': {'f': 3}, 'g': {1}}
+        second = {'a': {'b': [{'c': 4}, {'d': 2}, 5]}, 'e': {'f': 3},
+                  'g': {1, 2}}
+        changes = list(diff(first, second))
+        patched = patch(changes, first, copy='shared')
+        assert patched == second
+        assert first['a']['b'] == [{'c': 1}, {'d': 2}]
+        assert first['g'] == {1}
+        assert patched['e'] is first['e']
+        assert patched['a']['b'][1] is first['a']['b'][1]
+        assert revert(changes, patched, copy='shared') == first
+        assert patched == second
+
+        patched['a']['b'][0]['c'] = 6
+        assert first['a']['b'][0] == {'c': 1}
+        self.assertRaises(ValueError, patch, changes, first, copy='none')
+
+    def test_list_runs(self):
+        first = {'a': list(range(10))}
+        second = {'a': [0, 'x', 'y', 1, 2, 6, 'z', 9]}
+        for kwargs in ({}, {'expand': True}, {'list_algorithm': 'myers'},
+                       {'list_algorithm': 'myers', 'expand': True}):
+            result = list(diff(first, second, **kwargs))
+            assert patch(result, first) == second
+            assert revert(result, second) == first
+
+        result = [('add', 'a', [(-1, 'x'), (0, 'y')]),
+                  ('add', 'a', [(1, 'z')]),
+                  ('remove', 'a', [(4, 2)]),
+                  ('remove', 'a', [(2, 1), (0, 'y')])]
+        assert patch(result, {'a': [1, 2]}) == {'a': ['z', 'x']}
+        # the items of a run are merged without changing the diff result
+        assert result[0] == ('add', 'a', [(-1, 'x'), (0, 'y')])
+
+        class List(list):
+            def insert(self, index, value):
+                super(List, self).insert(index, value * 2)
+
+        assert patch([('add', '', [(0, 1), (1, 2)])], List()) == [2, 4]
+        self.assertRaises(IndexError, patch,
+                          [('remove', 'a', [(2, 'c'), (1, 'b')])],
+                          {'a': [1, 2]})
+
+    @unittest.skipIf(not HAS_NUMPY, 'NumPy is not installed')
+    def test_shared_copy_patch_numpy(self):
+        import numpy as np
+        first = {'a': np.array([[1, 2], [3, 4]])}
+        patched = patch([('change', ['a', 1, 0], (3, 5))], first,
+                        copy='shared')
+        assert patched['a'].tolist() == [[1, 2], [5, 4]]
+        assert first['a'].tolist() == [[1, 2], [3, 4]]
+
 
 class SwapperTests(unittest.TestCase):
     def test_addition(self):
@@ -719,6 +1133,60 @@ class SwapperTests(unittest.TestCase):
         result = list(diff(first, second))
         assert first == revert(result, second)
 
+    def test_remove_list_items(self):
+        result = 'remove', 'a', [(3, 'd'), (1, 'b')]
+        assert next(swap([result])) == ('add', 'a', [(3, 'd'), (1, 'b')])
+        swapped = 'add', 'a', [(1, 'b'), (3, 'd')]
+        assert next(swap([result], reverse=True)) == swapped
+
+        first = {'a': ['a', 'b', 'c', 'd']}
+        second = {'a': ['a', 'c']}
+        assert first == patch(swap([result], reverse=True), second)
+
+    def test_swap_reverse(self):
+        result = [('add', 'a', [(0, 'x'), (2, 'y')]),
+                  ('remove', 'a', [(4, 'z'), (1, 'w')]),
+                  ('change', 'b', (1, 2))]
+        assert list(swap(result, reverse=True)) == [
+            ('change', 'b', (2, 1)),
+            ('add', 'a', [(1, 'w'), (4, 'z')]),
+            ('remove', 'a', [(2, 'y'), (0, 'x')])]
+        assert list(swap(iter(result))) == [
+            ('remove', 'a', [(2, 'y'), (0, 'x')]),
+            ('add', 'a', [(4, 'z'), (1, 'w')]),
+            ('change', 'b', (2, 1))]
+
+    def test_revert_expanded(self):
+        first = [1]
+        second = [1, 2, 3]
+        result = list(diff(first, second, expand=True))
+        assert len(result) == 2
+        assert first == revert(result, second)
+
+    def test_revert_path_limit(self):
+        first = {}
+        second = {'a': {'b': 'c'}}
+        result = list(diff(first, second, path_limit=PathLimit()))
+        assert result == [('add', '', [('a', {})]), ('add', 'a', [('b', 'c')])]
+        assert first == revert(result, second)
+
+    def test_replaced_containers(self):
+        first = {'a': [{'b': 1}, {'b': 2}], 'c': {'d': {'e': 1}}}
+        result = [
+            ('change', 'a.1.b', (2, 3)),
+            ('remove', 'a', [(0, {'b': 1})]),
+            ('change', 'a.0.b', (3, 4)),
+            ('change', ['c', 'd', 'e'], (1, 2)),
+            ('change', 'c.d', ({'e': 2}, {'e': 5})),
+            ('change', 'c.d.e', (5, 6)),
+            ('remove', 'c', [('d', {'e': 6})]),
+            ('add', 'c', [('d', {'e': 7})]),
+            ('change', 'c.d.e', (7, 8)),
+        ]
+        second = {'a': [{'b': 4}], 'c': {'d': {'e': 8}}}
+        assert second == patch(result, first)
+        assert first == revert(result, second)
+
 
 class DotLookupTest(unittest.TestCase):
     def test_list_lookup(self):
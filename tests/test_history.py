@@ -0,0 +1,134 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+import os
+import tempfile
+import unittest
+
+from dictdiffer import HAS_NUMPY, patch, revert
+from dictdiffer.history import DocumentHistory, FileBackend, MemoryBackend
+
+
+def make_versions(count):
+    versions = []
+    document = {'name': 'doc', 'items': [], 'meta': {'count': 0}}
+    for number in range(count):
+        document = {'name': document['name'],
+                    'items': document['items'] + [{'id': number}],
+                    'meta': {'count': number, 'odd': bool(number % 2)}}
+        if number % 5 == 4:
+            document['items'] = document['items'][2:]
+        versions.append(document)
+    return versions
+
+
+class DocumentHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.versions = make_versions(23)
+
+    def assert_history(self, history):
+        self.assertEqual(len(history), len(self.versions))
+        for number, document in enumerate(self.versions):
+            self.assertEqual(history.get(number), document)
+        self.assertEqual(list(history.versions()),
+                         list(enumerate(self.versions)))
+        self.assertEqual(list(history.versions(reverse=True)),
+                         list(reversed(list(enumerate(self.versions)))))
+
+    def test_memory(self):
+        history = DocumentHistory(checkpoint_interval=5)
+        for number, document in enumerate(self.versions):
+            self.assertEqual(history.commit(document), number)
+        self.assertEqual(history.checkpoints, [0, 5, 10, 15, 20])
+        self.assert_history(history)
+
+        history.get(22)['meta']['count'] = -1
+        self.assertEqual(history.get(22), self.versions[22])
+        self.assertRaises(KeyError, history.get, 23)
+        self.assertRaises(KeyError, history.get, -1)
+        self.assertRaises(KeyError, DocumentHistory().get, 0)
+
+    def test_chain_cost(self):
+        history = DocumentHistory(checkpoint_interval=100, max_chain_cost=6)
+        for document in self.versions:
+            history.commit(document)
+        self.assertGreater(len(history.checkpoints), 2)
+        self.assertLess(len(history.checkpoints), len(self.versions))
+        self.assert_history(history)
+
+    def test_changes(self):
+        history = DocumentHistory(checkpoint_interval=4)
+        for document in self.versions:
+            history.commit(document)
+        forward = history.changes(3, 17)
+        self.assertEqual(patch(forward, self.versions[3]), self.versions[17])
+        self.assertEqual(revert(forward, self.versions[17]),
+                         self.versions[3])
+        backward = history.changes(17, 3)
+        self.assertEqual(patch(backward, self.versions[17]),
+                         self.versions[3])
+        self.assertEqual(history.changes(5, 5), [])
+
+    @unittest.skipIf(not HAS_NUMPY, 'NumPy is not installed')
+    def test_vectorized_arrays(self):
+        import numpy as np
+        history = DocumentHistory(checkpoint_interval=10,
+                                  vectorize_arrays=True)
+        for number in range(4):
+            values = np.arange(6.0)
+            values[number] = -1
+            history.commit({'values': values, 'number': number})
+        self.assertEqual(history.get(1)['values'].tolist(),
+                         [0, -1, 2, 3, 4, 5])
+        changes = history.changes(0, 3)
+        self.assertEqual(patch(changes, history.get(0))['values'].tolist(),
+                         history.get(3)['values'].tolist())
+        backward = history.changes(3, 1)
+        self.assertEqual(patch(backward, history.get(3))['values'].tolist(),
+                         history.get(1)['values'].tolist())
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            history = DocumentHistory(FileBackend(directory),
+                                      checkpoint_interval=6)
+            for document in self.versions[:10]:
+                history.commit(document)
+            self.assertEqual(sorted(os.listdir(directory))[:3], [
+                'checkpoint-00000000.pickle', 'checkpoint-00000006.pickle',
+                'delta-00000001.ddif'])
+
+            history = DocumentHistory(FileBackend(directory),
+                                      checkpoint_interval=6)
+            self.assertEqual(history.head, 9)
+            self.assertEqual(history.get(8), self.versions[8])
+            for document in self.versions[10:]:
+                history.commit(document)
+            self.assertEqual(history.checkpoints, [0, 6, 12, 18])
+            self.assert_history(history)
+            self.assertFalse([name for name in os.listdir(directory)
+                              if name.endswith('.tmp')])
+
+    def test_file_backend_dotted_keys(self):
+        versions = [{'a': {'b': 1}, 'a.b': {}},
+                    {'a': {'b': 2}, 'a.b': {'x': 1}},
+                    {'a': {'b': 3}, 'a.b': {'x': 2}}]
+        with tempfile.TemporaryDirectory() as directory:
+            history = DocumentHistory(FileBackend(directory))
+            for document in versions:
+                history.commit(document)
+            history = DocumentHistory(FileBackend(directory))
+            for version, document in enumerate(versions):
+                self.assertEqual(history.get(version), document)
+
+    def test_memory_backend_copies(self):
+        backend = MemoryBackend()
+        document = {'a': [1]}
+        backend.write_checkpoint(0, document)
+        backend.write_delta(1, [('add', 'a', [(1, {'b': 2})])])
+        document['a'].append(2)
+        self.assertEqual(backend.read_checkpoint(0), {'a': [1]})
+        delta = backend.read_delta(1)
+        delta[0][2][0][1]['b'] = 3
+        self.assertEqual(backend.read_delta(1),
+                         [('add', 'a', [(1, {'b': 2})])])
+        self.assertEqual((backend.checkpoints(), backend.deltas()), ([0], [1]))
@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+import unittest
+
+from dictdiffer import diff, patch
+from dictdiffer.parallel import (_estimate_size, _split_keys, parallel_diff,
+                                 patch_many)
+from dictdiffer.utils import PathLimit
+
+
+class ParallelDiffTests(unittest.TestCase):
+    def setUp(self):
+        self.first = {'key{0}'.format(i): {'values': list(range(i % 7)),
+                                           'value': i * 1.0}
+                      for i in range(40)}
+        self.first['big'] = {'items': list(range(5000))}
+        self.first['removed'] = {'a': 1}
+        self.second = {key: {'values': list(value.get('values', [])),
+                             'value': value.get('value')}
+                       for key, value in self.first.items()}
+        self.second['key3']['values'].append(3)
+        self.second['key9']['value'] = 9.5
+        self.second['key12']['value'] = 12.0 + 1e-9
+        self.second['big'] = {'items': list(range(1, 5001))}
+        del self.second['removed']
+        self.second['added'] = [1, 2]
+
+    def assert_same_diff(self, **kwargs):
+        expected = list(diff(self.first, self.second, **kwargs))
+        result = list(parallel_diff(self.first, self.second, workers=2,
+                                    **kwargs))
+        self.assertEqual(result, expected)
+        return result
+
+    def test_parallel_diff(self):
+        result = self.assert_same_diff()
+        self.assertIn(('change', 'key9.value', (9.0, 9.5)), result)
+        self.assertEqual(result[-2:], [
+            ('add', '', [('added', [1, 2])]),
+            ('remove', '', [('removed', {'a': 1})]),
+        ])
+
+    def test_parallel_diff_arguments(self):
+        self.assert_same_diff(ignore={'big', 'key3'})
+        self.assert_same_diff(path_limit=PathLimit([('big', 'items')]))
+        result = self.assert_same_diff(tolerance=1e-6, expand=True)
+        self.assertNotIn(('change', 'key12.value', (12.0, 12.0 + 1e-9)),
+                         result)
+
+    def test_parallel_diff_max_diffs(self):
+        for count in (0, 1, 3, 100):
+            self.assertEqual(
+                list(parallel_diff(self.first, self.second, workers=2,
+                                   max_diffs=count)),
+                list(diff(self.first, self.second, max_diffs=count)))
+
+    def test_parallel_diff_fallback(self):
+        self.assertEqual(list(parallel_diff([1, 2], [1, 3], workers=2)),
+                         [('change', [1], (2, 3))])
+        self.assertEqual(list(parallel_diff(self.first, self.second,
+                                            workers=1)),
+                         list(diff(self.first, self.second)))
+
+    def test_split_keys(self):
+        self.assertEqual(_split_keys(list('abcdef'), [1, 1, 10, 1, 1, 1], 4),
+                         [['a', 'b'], ['c'], ['d', 'e', 'f']])
+        self.assertEqual(_split_keys([], [], 4), [])
+
+    def test_estimate_size(self):
+        self.assertEqual(_estimate_size(1), 1)
+        self.assertEqual(_estimate_size([]), 1)
+        self.assertEqual(_estimate_size(list(range(100))), 101)
+        self.assertGreater(_estimate_size({'a': [[1, 2]] * 10}),
+                           _estimate_size({'a': [1] * 10}))
+
+
+class PatchManyTests(unittest.TestCase):
+    def setUp(self):
+        self.result = list(diff({'a': {'b': [1, 2]}, 'c': 1},
+                                {'a': {'b': [1, 3, 4]}, 'd': {'e': []}}))
+        self.documents = [{'a': {'b': [i, 2]}, 'c': i} for i in range(25)]
+        self.documents[7] = {'a': {}}
+        self.documents[12] = {'a': {'b': [1]}, 'c': 1}
+
+    def assert_patched(self, results, documents):
+        self.assertEqual(len(results), len(documents))
+        for index, (document, (patched, error)) in enumerate(
+                zip(documents, results)):
+            if index in (7, 12):
+                self.assertIsNone(patched)
+                self.assertIsInstance(error, (KeyError, IndexError))
+            else:
+                self.assertIsNone(error)
+                self.assertEqual(patched, patch(self.result, document))
+
+    def test_patch_many(self):
+        results = list(patch_many(self.result, iter(self.documents),
+                                  workers=2, chunk_size=3))
+        self.assert_patched(results, self.documents)
+        self.assertEqual(self.documents[0], {'a': {'b': [0, 2]}, 'c': 0})
+        self.assertIsNot(results[0][0]['d'], results[1][0]['d'])
+
+    def test_patch_many_serial(self):
+        results = list(patch_many(self.result, self.documents, workers=1,
+                                  copy='shared'))
+        self.assert_patched(results, self.documents)
+
+        documents = [{'a': {'b': [1, 2]}, 'c': 1}]
+        results = list(patch_many(self.result, documents, workers=1,
+                                  in_place=True))
+        self.assertIs(results[0][0], documents[0])
+        self.assertEqual(documents[0], {'a': {'b': [1, 3, 4]},
+                                        'd': {'e': []}})
+
+        with self.assertRaises(ValueError):
+            next(patch_many(self.result, documents, copy='none'))
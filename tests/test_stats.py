@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+import unittest
+
+from dictdiffer.stats import changed_paths, diff_stats
+
+
+class StatsTests(unittest.TestCase):
+    def setUp(self):
+        self.first = {'a': {'b': 1, 'c': [1, 2, 3]}, 'tags': {1, 2},
+                      'old': 'x', 'same': {'deep': [1]}}
+        self.second = {'a': {'b': 'one', 'c': [1, 5]}, 'tags': {2, 3, 4},
+                       'new': [1, 2], 'same': {'deep': [1]}}
+
+    def test_changed_paths(self):
+        self.assertEqual(changed_paths(self.first, self.second), {
+            ('a', 'b'), ('a', 'c', 1), ('a', 'c', 2), ('tags',), ('old',),
+            ('new',),
+        })
+        self.assertEqual(changed_paths(self.first, self.first), set())
+        self.assertEqual(changed_paths(self.first, self.second,
+                                       ignore={'a', 'tags'}),
+                         {('old',), ('new',)})
+
+    def test_diff_stats(self):
+        stats = diff_stats(self.first, self.second)
+        self.assertEqual((stats['add'], stats['remove'], stats['change']),
+                         (3, 3, 2))
+        self.assertEqual(stats['keys'], {
+            'a': {'add': 0, 'remove': 1, 'change': 2},
+            'tags': {'add': 2, 'remove': 1, 'change': 0},
+            'old': {'add': 0, 'remove': 1, 'change': 0},
+            'new': {'add': 1, 'remove': 0, 'change': 0},
+        })
+        self.assertNotIn('depths', stats)
+        self.assertNotIn('types', stats)
+
+        stats = diff_stats(1, 2)
+        self.assertEqual(stats['keys'],
+                         {None: {'add': 0, 'remove': 0, 'change': 1}})
+
+    def test_diff_stats_histograms(self):
+        stats = diff_stats(self.first, self.second, by_depth=True,
+                           by_type=True)
+        self.assertEqual(stats['depths'], {
+            1: {'add': 3, 'remove': 2, 'change': 0},
+            2: {'add': 0, 'remove': 0, 'change': 1},
+            3: {'add': 0, 'remove': 1, 'change': 1},
+        })
+        self.assertEqual(stats['types']['str'],
+                         {'add': 0, 'remove': 1, 'change': 1})
+        self.assertEqual(stats['types']['list'],
+                         {'add': 1, 'remove': 0, 'change': 0})
+
+    def test_first_list_indexes(self):
+        first = {'f': [{}, 1, {2, 4}]}
+        second = {'f': [1, {4, 5}]}
+        self.assertEqual(changed_paths(first, second,
+                                       list_algorithm='myers'),
+                         {('f', 0), ('f', 2)})
+        stats = diff_stats(first, second, list_algorithm='myers')
+        self.assertEqual((stats['add'], stats['remove'], stats['change']),
+                         (1, 2, 0))
+
+    def test_node(self):
+        stats = diff_stats({'s': {1}, 'l': []}, {'s': {2}, 'l': [{3}]},
+                           node=['x', 'y'])
+        self.assertEqual((stats['add'], stats['remove'], stats['change']),
+                         (2, 1, 0))
+        self.assertEqual(changed_paths({'s': {1}, 'l': []},
+                                       {'s': {2}, 'l': [{3}]},
+                                       node=['x', 'y']),
+                         {('x', 'y', 's'), ('x', 'y', 'l', 0)})
+
+    def test_values_are_not_copied(self):
+        class NoCopy(dict):
+            def __deepcopy__(self, memo):
+                raise AssertionError('copied')
+
+        stats = diff_stats({'b': NoCopy(x=1)}, {'a': NoCopy(x=2)})
+        self.assertEqual((stats['add'], stats['remove']), (1, 1))
+        self.assertEqual(changed_paths({'a': NoCopy(x=1)}, {'a': 1}),
+                         {('a',)})
+
+    def test_vectorized_arrays(self):
+        import numpy as np
+        first = {'a': np.array([[1, 2], [3, 4]]), 'b': np.array([1.0, 2.0])}
+        second = {'a': np.array([[1, 5], [6, 4]]), 'b': np.array([1.0, 2.5])}
+        paths = changed_paths(first, second)
+        self.assertEqual(paths, {('a', 0, 1), ('a', 1, 0), ('b', 1)})
+        self.assertEqual(changed_paths(first, second, vectorize_arrays=True),
+                         paths)
+
+        stats = diff_stats(first, second, vectorize_arrays=True,
+                           by_depth=True, by_type=True)
+        self.assertEqual(stats, diff_stats(first, second, by_depth=True,
+                                           by_type=True))
+        self.assertEqual(stats['keys']['a'],
+                         {'add': 0, 'remove': 0, 'change': 2})
@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+import os
+import random
+import tempfile
+import unittest
+
+from dictdiffer import diff, patch
+from dictdiffer.stream import external_sort, stream_diff
+
+
+class StreamDiffTests(unittest.TestCase):
+    def setUp(self):
+        self.first = {key: {'id': key, 'value': key % 7}
+                      for key in range(0, 300, 2)}
+        self.second = {key: {'id': key, 'value': key % 5}
+                       for key in range(0, 300, 3)}
+
+    def test_stream_diff(self):
+        for batch_size in (1, 7, 1000):
+            result = list(stream_diff(sorted(self.first.items()),
+                                      sorted(self.second.items()),
+                                      batch_size=batch_size))
+            self.assertEqual(patch(result, self.first), self.second)
+        self.assertEqual(result, list(diff(self.first, self.second)))
+
+    def test_stream_diff_arguments(self):
+        result = list(stream_diff(sorted(self.first.items()),
+                                  sorted(self.second.items()),
+                                  batch_size=10, ignore={('*', 'value')},
+                                  dot_notation=False))
+        self.assertNotIn('change', [action for action, _, _ in result])
+        self.assertEqual(list(stream_diff([], [])), [])
+        self.assertEqual(list(stream_diff([('a', 1)], [])),
+                         [('remove', '', [('a', 1)])])
+
+    def test_stream_diff_max_diffs(self):
+        def pairs(records, read):
+            for pair in sorted(records.items()):
+                read.append(pair)
+                yield pair
+
+        read = []
+        result = list(stream_diff(pairs(self.first, read),
+                                  pairs(self.second, []),
+                                  batch_size=10, max_diffs=3))
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result,
+                         list(stream_diff(sorted(self.first.items()),
+                                          sorted(self.second.items()),
+                                          batch_size=10))[:3])
+        self.assertLess(len(read), len(self.first))
+
+    def test_stream_diff_unsorted(self):
+        with self.assertRaises(ValueError):
+            list(stream_diff([(2, {}), (1, {})], []))
+        with self.assertRaises(ValueError):
+            list(stream_diff([], [(1, {}), (1, {})]))
+
+    def test_external_sort(self):
+        pairs = [(random.random(), {'record': i}) for i in range(500)]
+        with tempfile.TemporaryDirectory() as directory:
+            result = external_sort(iter(pairs), buffer_size=64,
+                                   directory=directory)
+            self.assertEqual(next(result), min(pairs, key=lambda p: p[0]))
+            self.assertEqual(len(os.listdir(directory)), 0)  # unlinked
+            result = [next(result)] + list(result)
+        self.assertEqual(len(result), 499)
+        self.assertEqual(result,
+                         sorted(pairs, key=lambda p: p[0])[1:])
+        self.assertEqual(list(external_sort([(2, {}), (1, [])])),
+                         [(1, []), (2, {})])
+
+    def test_stream_diff_external_sort(self):
+        first = list(self.first.items())
+        second = list(self.second.items())
+        random.shuffle(first)
+        random.shuffle(second)
+        result = list(stream_diff(external_sort(first, buffer_size=16),
+                                  external_sort(second, buffer_size=16),
+                                  batch_size=20))
+        self.assertEqual(patch(result, self.first), self.second)
@@ -18,3 +18,10 @@ class AssertNoDiffTest(unittest.TestCase):
         dict2 = {2: '2'}
         with pytest.raises(AssertionError):
             assert_no_diff(dict1, dict2)
+
+    def test_positional_arguments(self):
+        assert_no_diff({'a': {'b': 1}}, {'a': {'b': 1, 'c': 2}}, None,
+                       {'a.c'})
+        assert_no_diff({'a': 1, 'b': 1}, {'a': 1, 'b': 2}, None, {'b'})
+        with pytest.raises(AssertionError):
+            assert_no_diff({'a': 1, 'b': 1}, {'a': 2, 'b': 2}, None, {'b'})
@@ -0,0 +1,104 @@
+# SPDX-FileCopyrightText: 2026 CERN.
+# SPDX-License-Identifier: MIT
+
+import copy
+import unittest
+
+from dictdiffer import diff, patch, revert
+from dictdiffer.tracking import TrackedDict, TrackedList, TrackedSet
+
+
+class TrackingTests(unittest.TestCase):
+    def setUp(self):
+        self.data = {'a': {'b': {'c': 1}}, 'items': [{'id': 1}, [1, 2]],
+                     'x': 0}
+        self.tracked = TrackedDict(self.data)
+
+    def test_tracked_containers(self):
+        self.assertIsInstance(self.tracked['a']['b'], TrackedDict)
+        self.assertIsInstance(self.tracked['items'], TrackedList)
+        self.assertEqual(self.tracked, self.data)
+        self.assertEqual(self.tracked['items'], self.data['items'])
+        self.assertEqual(list(diff(self.data, self.tracked)), [])
+        self.assertEqual(self.tracked.diff_since(), [])
+
+    def test_diff_since(self):
+        snapshot = copy.deepcopy(self.data)
+        self.tracked['a']['b']['c'] = 2
+        checkpoint = self.tracked.checkpoint()
+        self.tracked['items'].insert(0, {'id': 0})
+        self.tracked['items'][1]['id'] = 10
+        self.tracked['items'][2].append(3)
+        del self.tracked['x']
+        self.tracked['new'] = {'d': [1]}
+        self.tracked['new']['d'].append(2)
+
+        self.assertEqual(self.tracked.diff_since(checkpoint), [
+            ('add', ['items'], [(0, {'id': 0})]),
+            ('change', ['items', 1, 'id'], (1, 10)),
+            ('add', ['items', 2], [(2, 3)]),
+            ('remove', [], [('x', 0)]),
+            ('add', [], [('new', {'d': [1]})]),
+            ('add', ['new', 'd'], [(1, 2)]),
+        ])
+
+        journal = self.tracked.diff_since()
+        self.assertEqual(patch(journal, snapshot), self.tracked)
+        self.assertEqual(revert(journal, copy.deepcopy(self.tracked)),
+                         snapshot)
+
+    def test_list_operations(self):
+        tracked = TrackedList([0, 1, 2, 3, 4])
+        snapshot = list(tracked)
+        tracked[1:3] = ['a', 'b', 'c']
+        del tracked[::2]
+        tracked[-1] = 'last'
+        tracked.extend([5, 6])
+        tracked.remove(5)
+        tracked.reverse()
+        self.assertEqual(patch(tracked.diff_since(), snapshot), tracked)
+        with self.assertRaises(IndexError):
+            tracked[10] = 1
+        with self.assertRaises(ValueError):
+            tracked[::2] = [1]
+
+    def test_replaced_values(self):
+        nested = self.tracked['a']
+        self.tracked['a'] = {'other': 1}
+        checkpoint = self.tracked.checkpoint()
+        nested['b'] = 2
+        self.assertEqual(self.tracked.diff_since(checkpoint), [])
+        self.assertEqual(nested.diff_since(), [('change', ['b'],
+                                                ({'c': 1}, 2))])
+        with self.assertRaises(ValueError):
+            self.tracked['items'].diff_since()
+
+        copied = copy.deepcopy(self.tracked)
+        copied['x'] = 1
+        self.assertEqual(copied.diff_since(), [('change', ['x'], (0, 1))])
+        self.assertEqual(self.tracked['x'], 0)
+
+    def test_sets_and_sequences(self):
+        from collections import deque
+
+        data = {'s': {1, 2}, 'q': deque([1])}
+        tracked = TrackedDict(data)
+        self.assertIsInstance(tracked['s'], TrackedSet)
+        self.assertIsInstance(tracked['q'], TrackedList)
+        self.assertEqual(tracked, {'s': {1, 2}, 'q': [1]})
+
+        checkpoint = tracked.checkpoint()
+        tracked['s'].add(3)
+        tracked['s'].add(3)
+        tracked['s'] -= {1}
+        tracked['q'] += [2]
+        self.assertEqual(tracked.diff_since(checkpoint), [
+            ('add', ['s'], [(0, {3})]),
+            ('remove', ['s'], [(0, {1})]),
+            ('add', ['q'], [(1, 2)]),
+        ])
+        self.assertEqual(patch(tracked.diff_since(), data),
+                         {'s': {2, 3}, 'q': deque([1, 2])})
+        self.assertEqual(list(diff({'s': {2, 3}}, {'s': tracked['s']})),
+                         [])
+        self.assertEqual(copy.deepcopy(tracked)['s'], {2, 3})
@@ -3,8 +3,12 @@
 
 import unittest
 
-from dictdiffer.utils import (PathLimit, WildcardDict, create_dotted_node,
-                              dot_lookup, get_path, is_super_path, nested_hash)
+from dictdiffer.utils import (ListKey, ListKeyIndex, NodePath, PathCache,
+                              PathLimit, PathMatcher, WildcardDict,
+                              create_dotted_node, different_items, dot_lookup,
+                              get_path, is_super_path, multiset_difference,
+                              myers_opcodes, nested_hash, split_node,
+                              structural_hash)
 
 
 class UtilsTest(unittest.TestCase):
@@ -67,6 +71,103 @@ class UtilsTest(unittest.TestCase):
         self.assertTrue(path_limit.path_is_limit(('authors', 2)))
         self.assertFalse(path_limit.path_is_limit(('authors', 'name', 'foo')))
 
+    def test_pathmatcher(self):
+        matcher = PathMatcher([(('author', 'name'), 'exact'),
+                               (('author', '*'), 'wildcard'),
+                               (('*', 'id'), 'id')])
+        start = matcher.start
+        self.assertIsNone(matcher.match(start))
+        self.assertIsNone(matcher.match(matcher.walk(start, ['author'])))
+        states = matcher.walk(start, ['author', 'name'])
+        self.assertEqual(matcher.match(states), 'exact')
+        self.assertEqual(matcher.match(matcher.walk(start, ['author', 1])),
+                         'wildcard')
+        self.assertEqual(matcher.match(matcher.walk(start, ['title', 'id'])),
+                         'id')
+        self.assertEqual(matcher.walk(start, ['title', 'name']), ())
+        self.assertEqual(PathMatcher().start, ())
+
+    def test_nodepath(self):
+        root = NodePath()
+        self.assertEqual(root.keys(), [])
+        self.assertEqual(root.dotted(), '')
+
+        parent = NodePath.from_keys(['a', 'b'])
+        first = parent.child('c')
+        second = parent.child(1)
+        self.assertIs(first.parent, second.parent)
+        self.assertEqual(first.keys(), ['a', 'b', 'c'])
+        self.assertEqual(first.dotted(), 'a.b.c')
+        self.assertEqual(second.keys(), ['a', 'b', 1])
+        self.assertIsNone(second.dotted())
+        self.assertIsNone(root.child('x.y').dotted())
+
+        keys = first.keys()
+        keys.append('d')
+        self.assertEqual(first.keys(), ['a', 'b', 'c'])
+
+    def test_myers_opcodes(self):
+        self.assertEqual(myers_opcodes([], []), [])
+        self.assertEqual(myers_opcodes([1, 2], [1, 2]),
+                         [('equal', 0, 2, 0, 2)])
+        self.assertEqual(myers_opcodes('abcabba', 'cbabac'),
+                         [('delete', 0, 2, 0, 0),
+                          ('equal', 2, 3, 0, 1),
+                          ('insert', 3, 3, 1, 2),
+                          ('equal', 3, 5, 2, 4),
+                          ('delete', 5, 6, 4, 4),
+                          ('equal', 6, 7, 4, 5),
+                          ('insert', 7, 7, 5, 6)])
+        self.assertEqual(myers_opcodes([{'a': 1}, 2, 3, 4], [5, 3, 4],
+                                       max_cost=1),
+                         [('replace', 0, 2, 0, 1), ('equal', 2, 4, 1, 3)])
+
+    def test_myers_opcodes_anchors(self):
+        first = list(range(100))
+        second = [-1] + first[:40] + first[41:70] + ['x'] + first[70:] + [-2]
+        opcodes = myers_opcodes(first, second, max_cost=2)
+        self.assertEqual(opcodes, myers_opcodes(first, second))
+        self.assertEqual([opcode for opcode in opcodes
+                          if opcode[0] != 'equal'],
+                         [('insert', 0, 0, 0, 1), ('delete', 40, 41, 41, 41),
+                          ('insert', 70, 70, 70, 71),
+                          ('insert', 100, 100, 101, 102)])
+        # Repeated items are not anchors.
+        self.assertEqual(myers_opcodes([1, 1, 2, 2], [2, 2, 1, 1],
+                                       max_cost=2),
+                         [('replace', 0, 4, 0, 4)])
+
+    def test_listkey(self):
+        key = ListKey('id', 2)
+        self.assertEqual(key, ListKey('id', 2))
+        self.assertNotEqual(key, ListKey('id', 3))
+        self.assertNotEqual(key, 2)
+        self.assertEqual(len({key, ListKey('id', 2)}), 1)
+        self.assertEqual(repr(key), "ListKey('id', 2)")
+        self.assertEqual(key.find([{'id': 1}, 'x', {'id': 2}]), 2)
+        self.assertRaises(KeyError, key.find, [{'id': 1}])
+        self.assertEqual(dot_lookup({'a': [{'id': 1}, {'id': 2, 'b': 'c'}]},
+                                    ['a', key, 'b']), 'c')
+
+    def test_listkey_index(self):
+        records = [{'id': 1}, 'x', {'id': 2}, {'id': [3]}, {'id': 4},
+                   {'id': 4, 'b': 1}]
+        index = ListKeyIndex()
+        self.assertEqual(index.find(records, ListKey('id', 2)), 2)
+        self.assertEqual(index.find(records, ListKey('id', [3])), 3)
+        self.assertEqual(index.find(records, ListKey('id', 4)), 4)
+        self.assertRaises(KeyError, index.find, records, ListKey('id', 5))
+
+        # Stale positions are checked, missing values are scanned for.
+        records[2] = {'id': 5}
+        records.append({'id': 2})
+        self.assertEqual(index.find(records, ListKey('id', 2)), 6)
+        self.assertEqual(index.find(records, ListKey('id', 5)), 2)
+        del records[0]
+        index.forget(records)
+        self.assertEqual(index.find(records, ListKey('id', 2)), 5)
+        self.assertEqual(index.find(records, ListKey('id', 5)), 1)
+
     def test_create_dotted_node(self):
         node = ('foo', 'bar')
         self.assertEqual('foo.bar', create_dotted_node(node))
@@ -133,6 +234,69 @@ class UtilsTest(unittest.TestCase):
         self.assertEqual(dot_lookup({'a': {'b': 'hello'}}, ''),
                          {'a': {'b': 'hello'}})
 
+    def test_split_node(self):
+        self.assertEqual(split_node('a.b'), ('a', 'b'))
+        self.assertIs(split_node('a.b'), split_node('a.b'))
+        self.assertEqual(split_node(['a.b', 0]), ('a.b', 0))
+        self.assertEqual(split_node(None), ())
+        self.assertRaises(TypeError, split_node, 0)
+
+    def test_path_cache(self):
+        source = {'a': [{'id': 1, 'b': {}}, {'id': 2, 'b': {}}], 'c': {}}
+        cache = PathCache(source)
+        record = cache.lookup(('a', ListKey('id', 2)))
+        self.assertIs(record, source['a'][1])
+        self.assertIs(cache.lookup(('a', '1', 'b')), record['b'])
+
+        del source['a'][0]
+        cache.invalidate(source['a'])
+        self.assertIs(cache.lookup(('a', 0, 'b')), record['b'])
+        self.assertIs(cache.lookup(('a', 0)), record)
+
+        source['a'] = []
+        cache.invalidate(source)
+        self.assertRaises(IndexError, cache.lookup, ('a', 0))
+
+        # the last container looked up can be changed
+        cache.lookup(('a', ))
+        source['a'].append({'b': {'c': {}}})
+        self.assertIs(cache.lookup(('a', 0, 'b', 'c')),
+                      source['a'][0]['b']['c'])
+        self.assertRaises(KeyError, cache.lookup, ('a', 0, 'd', 'e'))
+        self.assertIs(cache.lookup(('a', 0, 'b')), source['a'][0]['b'])
+        self.assertIs(cache.lookup(('c', )), source['c'])
+        self.assertIs(cache.lookup(()), source)
+
+    def test_structural_hash(self):
+        self.assertEqual(structural_hash({'a': [1, {2}], 1: None}),
+                         structural_hash({1: None, 'a': [1.0, {2}]}))
+        self.assertEqual(structural_hash({'b': 1, 'a': 2}),
+                         structural_hash({'a': 2, 'b': 1}))
+        structural_hash({1: 'a', 'b': 2})  # keys are not sortable
+
+    def test_different_items(self):
+        try:
+            import numpy as np
+        except ImportError:  # pragma: no cover
+            self.skipTest('NumPy is not installed')
+        nan, inf = float('nan'), float('inf')
+        first = np.array([1.0, 2.0, nan, inf, inf, 1.0])
+        second = np.array([1.0, 2.1, nan, inf, -inf, nan])
+        index, = different_items(first, second, 0.01)
+        self.assertEqual(index.tolist(), [1, 4, 5])
+        index, = different_items(first, second, 0.1)
+        self.assertEqual(index.tolist(), [4, 5])
+        self.assertIsNone(different_items(first, second[:2], 0))
+        self.assertIsNone(different_items(np.array([{}]), np.array([{}]), 0))
+
+    def test_multiset_difference(self):
+        self.assertEqual(multiset_difference([], []), ([], []))
+        self.assertEqual(
+            multiset_difference([{'a': 1}, [1], {'a': 1}], [[1], {'a': 1}]),
+            ([2], []))
+        self.assertEqual(multiset_difference([1, 1], [1, 2, 1, 1]),
+                         ([], [1, 3]))
+
     def test_nested_hash(self):
         # No reasonable way to test this
         nested_hash([1, 2, 3])